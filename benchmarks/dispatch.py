@@ -0,0 +1,113 @@
+'''
+per-node overhead of ASTTranslator._translate_node
+
+python benchmarks/dispatch.py [<functions>]
+
+translates the examples/ corpus and a generated module with <functions>
+functions (default 500) with the current dispatch table and with the
+previous _translate_node (a fields dict, a formatted method name and a
+getattr for each node), and prints the time per dispatched node
+'''
+
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pseudo_python.parser
+from pseudo_python.ast_translator import ASTTranslator
+from pseudo_python.nodes import to_node
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+FUNCTION = '''def f%(j)d(a, b):
+    c = a * %(j)d + b
+    values = [a, b, c]
+    total = 0
+    for v in values:
+        if v > c - 2 and v < 100:
+            total += v
+        else:
+            total -= 1
+    return total
+
+x%(j)d = f%(j)d(%(j)d, 2)
+print(x%(j)d)
+
+'''
+
+class PreviousDispatch(ASTTranslator):
+    '''
+    the translator with the _translate_node before the dispatch table
+    '''
+
+    def _translate_node(self, node, in_call=False):
+        if isinstance(node, ast.AST):
+            fields = {field: getattr(node, field) for field in node._fields}
+            l = getattr(node, 'lineno', None)
+            if l:
+                fields['location'] = l, node.col_offset
+            else:
+                fields['location'] = None
+            if isinstance(node, ast.Attribute):
+                fields['in_call'] = in_call
+            result = getattr(self, '_translate_%s' % type(node).__name__.lower())(**fields)
+            return to_node(result) if self.slotted else result
+        return ASTTranslator._translate_node(self, node, in_call)
+
+class Counting(ASTTranslator):
+    def _translate_node(self, node, in_call=False):
+        if isinstance(node, ast.AST):
+            self.count += 1
+        return ASTTranslator._translate_node(self, node, in_call)
+
+def examples():
+    sources = []
+    for name in sorted(os.listdir(EXAMPLES)):
+        if name.endswith('.py'):
+            with open(os.path.join(EXAMPLES, name)) as f:
+                source = f.read()
+            try:
+                pseudo_python.translate(source)
+            except Exception:
+                continue
+            sources.append(source)
+    return sources
+
+def generated(functions):
+    return ''.join(FUNCTION % {'j': j} for j in range(functions))
+
+def measure(translator_class, sources, repeat):
+    trees = [(pseudo_python.parser.parse(source), source) for source in sources]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree, source in trees:
+            translator_class(tree, source).translate()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def count_nodes(sources):
+    total = 0
+    for source in sources:
+        translator = Counting(pseudo_python.parser.parse(source), source)
+        translator.count = 0
+        translator.translate()
+        total += translator.count
+    return total
+
+def main(args):
+    functions = int(args[0]) if args else 500
+    print('%-12s %8s %12s %12s %10s %10s' % ('input', 'nodes', 'previous', 'table', 'prev/node', 'table/node'))
+    for label, sources, repeat in (('examples', examples() * 10, 7), ('generated', [generated(functions)], 5)):
+        nodes = count_nodes(sources)
+        previous = measure(PreviousDispatch, sources, repeat)
+        table = measure(ASTTranslator, sources, repeat)
+        print('%-12s %8d %10.1fms %10.1fms %8.0fns %8.0fns' % (
+            label, nodes, previous * 1000, table * 1000, previous / nodes * 1e9, table / nodes * 1e9))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+'''
+name lookups in nested pseudo_python.env.Env scopes
+
+python benchmarks/env.py
+
+for nesting depths 1..50 looks up a name bound in the top env (like the
+TYPED_API entries and the functions), a name bound in the middle and a
+missing name from the innermost env, with Env and with the previous
+implementation walking the parents on every lookup (ChainEnv)
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pseudo_python.builtin_typed_api import TYPED_API
+from pseudo_python.env import Env
+
+DEPTHS = (1, 2, 5, 10, 20, 50)
+
+class ChainEnv:
+    '''
+    the Env before lookups were cached
+    '''
+
+    def __init__(self, values=None, parent=None):
+        self.values = values or {}
+        self.parent = parent
+        self.top = self if parent is None else parent.top
+
+    def __getitem__(self, key):
+        current = self
+        while current is not None:
+            if key in current.values:
+                return current.values[key]
+            current = current.parent
+
+    def __setitem__(self, key, value):
+        self.values[key] = value
+
+    def child_env(self, values=None):
+        return ChainEnv(values, self)
+
+def nested(env_class, depth):
+    env = env_class(dict(TYPED_API.items()))
+    env['functions'] = {}
+    for j in range(depth):
+        env = env.child_env({'x%d' % j: 'Int'})
+    return env
+
+def main():
+    number = 100000
+    print('%-6s %-8s %12s %12s' % ('depth', 'name', 'ChainEnv', 'Env'))
+    for depth in DEPTHS:
+        for label, name in (('top', 'functions'), ('middle', 'x%d' % (depth // 2)), ('missing', 'y')):
+            times = []
+            for env_class in (ChainEnv, Env):
+                env = nested(env_class, depth)
+                times.append(min(timeit.repeat('env[name]', globals={'env': env, 'name': name}, number=number, repeat=15)) / number * 1e9)
+            print('%-6d %-8s %10.0fns %10.0fns' % (depth, label, times[0], times[1]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+'''
+memory and time of translating the examples/ corpus with dict and slotted nodes
+
+python benchmarks/nodes.py [<copies>]
+
+translates every translatable example <copies> times (default 50), keeping
+all the modules alive, and prints the time, the memory retained by the
+modules and the peak memory (tracemalloc) for both node representations
+'''
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pseudo_python
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+def corpus():
+    sources = []
+    for name in sorted(os.listdir(EXAMPLES)):
+        if name.endswith('.py'):
+            with open(os.path.join(EXAMPLES, name)) as f:
+                source = f.read()
+            try:
+                pseudo_python.translate(source)
+            except Exception:
+                continue
+            sources.append(source)
+    return sources
+
+def measure(sources, copies, slotted):
+    '''
+    returns seconds, retained bytes and peak bytes for translating sources copies times
+    '''
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(copies):
+        for source in sources:
+            pseudo_python.translate(source, slotted=slotted)
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    modules = [pseudo_python.translate(source, slotted=slotted) for _ in range(copies) for source in sources]
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del modules
+    return seconds, retained, peak
+
+def main(args):
+    copies = int(args[0]) if args else 50
+    sources = corpus()
+    print('%d examples x %d copies' % (len(sources), copies))
+    print('%-8s %10s %14s %14s' % ('nodes', 'time', 'retained', 'peak'))
+    for slotted in (False, True):
+        pseudo_python.translate(sources[0], slotted=slotted)
+        seconds, retained, peak = measure(sources, copies, slotted)
+        print('%-8s %9.0fms %12.1fMB %12.1fMB' % ('slotted' if slotted else 'dict', seconds * 1000, retained / 1e6, peak / 1e6))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
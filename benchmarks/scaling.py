@@ -0,0 +1,119 @@
+'''
+fit the translation time against each parameter of the synthetic programs
+
+python benchmarks/scaling.py [<parameter>..] [-r <repeat>] [-t <tolerance>] [-o <results.json>]
+
+for each parameter of benchmarks/synthetic.py (or only the given ones)
+translates programs with growing values of it, the others at their defaults,
+and fits log(time) against log(n log n): a slope over 1 + <tolerance>
+(default 0.25) means the translation is worse than O(n log n) in it and
+the parameter is flagged (the exit code is 1 then)
+
+a size where the translation fails (e.g. a RecursionError) ends the
+series of that parameter and is reported as a failure (exit code 1 too)
+'''
+
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pseudo_python
+from synthetic import DEFAULTS, generate
+
+SIZES = {
+    'functions': (25, 50, 100, 200, 400, 800),
+    'depth': (2, 5, 10, 20, 40, 80, 160),
+    'hierarchy': (5, 10, 20, 40, 80),
+    'nesting': (10, 20, 40, 80, 160, 320, 640, 1280),
+    'literal': (250, 500, 1000, 2000, 4000, 8000)
+}
+
+# the other parameters while one of them grows: depth needs enough functions
+BASE = {'depth': {'functions': 160}}
+
+def best_time(source, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pseudo_python.translate(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def slope(points):
+    '''
+    least squares slope of log(seconds) against log(n log n)
+    '''
+    xs = [math.log(n * math.log(n)) for n, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+def measure(parameter, repeat, seed=0):
+    '''
+    returns [(value, seconds)] and the error ending the series or None
+    '''
+    points = []
+    for n in SIZES[parameter]:
+        parameters = dict(DEFAULTS, **BASE.get(parameter, {}))
+        parameters[parameter] = n
+        source = generate(seed, **parameters)
+        try:
+            points.append((n, best_time(source, repeat)))
+        except Exception as e:
+            return points, '%s at %s=%d: %s' % (type(e).__name__, parameter, n, str(e).split('\n')[0])
+    return points, None
+
+def main(args):
+    parameters, repeat, tolerance, output = [], 3, 0.25, None
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in ('-r', '--repeat') and args:
+            repeat = int(args.pop(0))
+        elif arg in ('-t', '--tolerance') and args:
+            tolerance = float(args.pop(0))
+        elif arg in ('-o', '--output') and args:
+            output = args.pop(0)
+        elif arg in SIZES:
+            parameters.append(arg)
+        else:
+            print(__doc__)
+            sys.exit(1)
+
+    results, flagged, failed = {}, [], []
+    for parameter in parameters or sorted(SIZES):
+        points, error = measure(parameter, repeat)
+        fitted = slope(points) if len(points) >= 3 else None
+        results[parameter] = {'points': points, 'slope': fitted, 'error': error}
+        print(parameter)
+        for n, seconds in points:
+            print('  %6d %10.2fms %10.1fns per n log n' % (n, seconds * 1000, seconds / (n * math.log(n)) * 1e9))
+        if error:
+            failed.append(parameter)
+            print('  %s' % error)
+        if fitted is None:
+            print('  too few sizes to fit')
+        elif fitted > 1 + tolerance:
+            flagged.append(parameter)
+            print('  slope %.2f against n log n: WORSE THAN O(n log n)' % fitted)
+        else:
+            print('  slope %.2f against n log n' % fitted)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if flagged:
+        print('superlinear: %s' % ', '.join(flagged))
+    if failed:
+        print('failed: %s' % ', '.join(failed))
+    if flagged or failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,231 @@
+'''
+the benchmark suite: time each stage over examples/ and scaled copies of it
+
+python benchmarks/suite.py [-o <results.json>] [-r <repeat>] [-s <scales>] [-l <languages>]
+python benchmarks/suite.py --compare <base.json> <head.json> [-t <threshold>]
+
+for every translatable example and for each scale k in <scales> (default
+10,50: the example repeated k times, with its top level names renamed in each
+copy, skipped if the copies don't translate) prints and saves the best
+time of <repeat> runs (default 5) of
+
+  parse            pseudo_python.parser.parse
+  translate        ASTTranslator(tree, source).translate
+  translate_to_yaml
+  generate:<lang>  pseudo.generate for each of <languages> (default py)
+
+with the lines/sec and nodes/sec of each stage and the peak memory
+(tracemalloc) of a parse + translate + yaml + generate run
+
+--compare flags every stage whose time grew by more than <threshold>
+(default 0.2: 20%) from base.json to head.json and exits with 1 if any did
+'''
+
+import ast
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tokenize
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pseudo_python
+import pseudo_python.parser
+import pseudo_python.serialization
+from pseudo_python.ast_translator import ASTTranslator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = os.path.join(ROOT, 'examples')
+
+def top_level_names(tree):
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+    return names
+
+def renamed(source, names, suffix):
+    '''
+    source with each name token in names (not an attribute) renamed to <name><suffix>
+    '''
+    lines = source.split('\n')
+    previous = None
+    replacements = []
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type == tokenize.NAME and token.string in names and previous != '.':
+            replacements.append(token.start)
+        if token.type not in (tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT):
+            previous = token.string
+    for line, column in reversed(replacements):
+        text = lines[line - 1]
+        end = column
+        while end < len(text) and (text[end].isalnum() or text[end] == '_'):
+            end += 1
+        lines[line - 1] = text[:end] + suffix + text[end:]
+    return '\n'.join(lines)
+
+def scaled(source, k):
+    '''
+    k copies of source, the top level names of copy j renamed to <name>_<j>
+    and the imports moved before all of them
+    '''
+    tree = pseudo_python.parser.parse(source)
+    names = top_level_names(tree)
+    imports = {node.lineno - 1 for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))}
+    lines = source.split('\n')
+    copies = []
+    for j in range(k):
+        copy = renamed(source, names, '_%d' % j).split('\n')
+        copies.append('\n'.join(line for i, line in enumerate(copy) if i not in imports))
+    return '\n'.join([lines[i] for i in sorted(imports)] + copies)
+
+def inputs(scales):
+    '''
+    [(label, source)] for the translatable examples and their scaled copies
+    '''
+    result = []
+    for name in sorted(os.listdir(EXAMPLES)):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(EXAMPLES, name)) as f:
+            source = f.read()
+        for k in (1,) + tuple(scales):
+            variant = source if k == 1 else scaled(source, k)
+            try:
+                pseudo_python.translate(variant)
+            except Exception:
+                break
+            result.append((name if k == 1 else '%s x%d' % (name, k), variant))
+    return result
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def measure(source, languages, repeat):
+    import pseudo
+    tree = pseudo_python.parser.parse(source)
+    module = ASTTranslator(tree, source).translate()
+    lines = source.count('\n') + 1
+    nodes = sum(1 for _ in ast.walk(tree))
+
+    stages = [
+        ('parse', lambda: pseudo_python.parser.parse(source)),
+        ('translate', lambda: ASTTranslator(pseudo_python.parser.parse(source), source).translate()),
+        ('translate_to_yaml', lambda: pseudo_python.translate_to_yaml(source))
+    ] + [('generate:%s' % language, lambda language=language: pseudo.generate(module, language)) for language in languages]
+
+    result = {'lines': lines, 'nodes': nodes, 'stages': {}}
+    for stage, function in stages:
+        seconds = best_time(function, repeat)
+        if stage == 'translate': # the parse is timed separately
+            seconds = max(seconds - result['stages']['parse']['seconds'], 1e-9)
+        result['stages'][stage] = {
+            'seconds': seconds,
+            'lines_per_second': lines / seconds,
+            'nodes_per_second': nodes / seconds
+        }
+
+    gc.collect()
+    tracemalloc.start()
+    module = ASTTranslator(pseudo_python.parser.parse(source), source).translate()
+    pseudo_python.serialization.dump(module, 'yaml')
+    for language in languages:
+        pseudo.generate(module, language)
+    result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+def revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(scales, languages, repeat):
+    results = {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'repeat': repeat,
+        'inputs': {}
+    }
+    print('%-28s %7s %8s %-18s %10s %12s %12s' % ('input', 'lines', 'nodes', 'stage', 'time', 'lines/s', 'nodes/s'))
+    for label, source in inputs(scales):
+        result = results['inputs'][label] = measure(source, languages, repeat)
+        for stage, stats in result['stages'].items():
+            print('%-28s %7d %8d %-18s %8.2fms %12.0f %12.0f' % (
+                label, result['lines'], result['nodes'], stage,
+                stats['seconds'] * 1000, stats['lines_per_second'], stats['nodes_per_second']))
+        print('%-28s %7s %8s %-18s %8.1fMB' % (label, '', '', 'peak memory', result['peak_memory'] / 1e6))
+    return results
+
+def compare(base, head, threshold):
+    '''
+    [(input, stage, base seconds, head seconds)] for the stages slower by more than threshold
+    '''
+    regressions = []
+    for label, result in sorted(head['inputs'].items()):
+        base_result = base['inputs'].get(label)
+        if base_result is None:
+            continue
+        for stage, stats in sorted(result['stages'].items()):
+            base_stats = base_result['stages'].get(stage)
+            if base_stats is not None and stats['seconds'] > base_stats['seconds'] * (1 + threshold):
+                regressions.append((label, stage, base_stats['seconds'], stats['seconds']))
+    return regressions
+
+def main(args):
+    output, repeat, scales, languages, threshold, compared = None, 5, (10, 50), ['py'], 0.2, None
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in ('-o', '--output') and args:
+            output = args.pop(0)
+        elif arg in ('-r', '--repeat') and args:
+            repeat = int(args.pop(0))
+        elif arg in ('-s', '--scales') and args:
+            scales = tuple(int(k) for k in args.pop(0).split(',') if k)
+        elif arg in ('-l', '--languages') and args:
+            languages = args.pop(0).split(',')
+        elif arg in ('-t', '--threshold') and args:
+            threshold = float(args.pop(0))
+        elif arg == '--compare' and len(args) >= 2:
+            compared = args.pop(0), args.pop(0)
+        else:
+            print(__doc__)
+            sys.exit(1)
+
+    if compared:
+        with open(compared[0]) as f:
+            base = json.load(f)
+        with open(compared[1]) as f:
+            head = json.load(f)
+        regressions = compare(base, head, threshold)
+        for label, stage, before, after in regressions:
+            print('%-28s %-18s %8.2fms -> %8.2fms (+%.0f%%)' % (label, stage, before * 1000, after * 1000, (after / before - 1) * 100))
+        print('%d regressions over %.0f%% (%s -> %s)' % (len(regressions), threshold * 100, base.get('revision'), head.get('revision')))
+        sys.exit(1 if regressions else 0)
+
+    results = run(scales, languages, repeat)
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('saved as %s' % output)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,123 @@
+'''
+seeded generator of pseudo-translatable programs
+
+generate(seed, functions=20, depth=4, hierarchy=3, nesting=4, literal=10)
+
+  functions  number of top level functions
+  depth      length of the call chains: the functions are in depth layers,
+             each one called by a function of the layer above and the first
+             layer called from the top scope (so every signature is inferred
+             from calls)
+  hierarchy  depth of a single inheritance chain of classes, each one
+             overriding the methods of its parent
+  nesting    number of binary operations in the expressions of each function
+  literal    number of elements of the list constants
+
+the programs use only snake_case locals, SCREAMING_CASE constants and Int /
+List[Int] values, so the same seed always gives the same, translatable source
+
+python benchmarks/synthetic.py [<seed> [<parameter>=<value>..]] prints one
+'''
+
+import random
+import sys
+
+DEFAULTS = {'functions': 20, 'depth': 4, 'hierarchy': 3, 'nesting': 4, 'literal': 10}
+
+OPERATORS = ('+', '-', '*')
+
+PARENTHESES = 32
+
+def expression(rng, names, nesting):
+    '''
+    a chain of nesting binary operations over names and small ints:
+    every few operations the chain so far is put in parentheses (at most
+    PARENTHESES levels: the cpython parser has a small stack for them)
+    '''
+    code = rng.choice(names)
+    for j in range(nesting):
+        operand = rng.choice(names) if rng.random() < 0.6 else str(rng.randint(1, 9))
+        code = '%s %s %s' % (code, rng.choice(OPERATORS), operand)
+        if j % 8 == 7 and j < PARENTHESES * 8:
+            code = '(%s)' % code
+    return code
+
+def layers(functions, depth):
+    depth = max(1, min(depth, functions))
+    result = [[] for _ in range(depth)]
+    for j in range(functions):
+        result[j * depth // functions].append('compute_%d' % j)
+    return result
+
+def function_source(rng, name, callees, nesting, constant):
+    lines = ['def %s(first, second):' % name]
+    lines.append('    value = %s' % expression(rng, ['first', 'second'], nesting))
+    lines.append('    if value > second:')
+    lines.append('        value = %s' % expression(rng, ['value', 'first'], max(1, nesting // 2)))
+    lines.append('    else:')
+    lines.append('        value = value + 1')
+    if callees:
+        for callee in callees:
+            lines.append('    value = value + %s(%s, %s)' % (callee, expression(rng, ['value', 'first'], 1), rng.randint(0, 9)))
+    else:
+        lines.append('    total = 0')
+        lines.append('    for element in %s:' % constant)
+        lines.append('        total += element * first')
+        lines.append('    value = value + total')
+    lines.append('    return value')
+    return '\n'.join(lines)
+
+def class_source(rng, j, nesting):
+    name = 'Level%d' % j
+    lines = ['class %s%s:' % (name, '' if j == 0 else '(Level%d)' % (j - 1))]
+    lines.append('    def __init__(self, amount):')
+    lines.append('        self.amount = amount')
+    lines.append('')
+    lines.append('    def score(self, bonus):')
+    lines.append('        return %s' % expression(rng, ['self.amount', 'bonus'], nesting))
+    lines.append('')
+    lines.append('    def scaled(self, factor):')
+    lines.append('        return self.score(factor) * %d' % (j + 1))
+    return '\n'.join(lines)
+
+def generate(seed, functions=20, depth=4, hierarchy=3, nesting=4, literal=10):
+    '''
+    the source of a translatable program for these parameters
+    '''
+    rng = random.Random(seed)
+    parts = []
+    constants = ['VALUES_%d' % j for j in range(2)]
+    for constant in constants:
+        parts.append('%s = [%s]' % (constant, ', '.join(str(rng.randint(0, 99)) for _ in range(max(1, literal)))))
+
+    for j in range(hierarchy):
+        parts.append(class_source(rng, j, nesting))
+
+    function_layers = layers(functions, depth)
+    for index, layer in enumerate(function_layers):
+        below = function_layers[index + 1] if index + 1 < len(function_layers) else []
+        callees = {name: [] for name in layer}
+        for k, callee in enumerate(below): # every function of the next layer has a caller
+            callees[layer[k % len(layer)]].append(callee)
+        for name in layer:
+            parts.append(function_source(rng, name, callees[name], nesting, rng.choice(constants)))
+
+    main = []
+    for j in range(hierarchy): # each class is constructed once
+        main.append('level_%d = Level%d(%d)' % (j, j, rng.randint(1, 9)))
+        main.append('print(level_%d.scaled(%d))' % (j, rng.randint(1, 9)))
+    for name in function_layers[0] if functions else []:
+        main.append('print(%s(%d, %d))' % (name, rng.randint(1, 9), rng.randint(1, 9)))
+    parts.append('\n'.join(main))
+    return '\n\n'.join(parts) + '\n'
+
+def main(args):
+    seed = int(args[0]) if args else 0
+    parameters = dict(DEFAULTS)
+    for arg in args[1:]:
+        name, _, value = arg.partition('=')
+        parameters[name] = int(value)
+    sys.stdout.write(generate(seed, **parameters))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,10 +1,84 @@
 import pseudo_python.parser
 import pseudo_python.ast_translator
-import yaml
+import pseudo_python.errors
 
-def translate(source):
-    return pseudo_python.ast_translator.ASTTranslator(pseudo_python.parser.parse(source), source).translate()
+__version__ = '0.2.34'
 
-def translate_to_yaml(source):
-    yaml.Dumper.ignore_aliases = lambda *args : True
-    return yaml.dump(translate(source))
+def translate(source, cache=None, slotted=False, profile=False, packed=False, jobs=1):
+    '''
+    translate source to a pseudo ast module
+
+    with slotted=True, nodes are pseudo_python.nodes slotted objects instead of dicts
+
+    with packed=True, literal only lists, sets and dicts are packed_literal nodes
+    (see pseudo_python.nodes): packed modules are not cached
+
+    with profile=True, returns (module, pseudo_python.profiler.Profile):
+    the source is always translated, without the cache, in one process
+
+    with jobs > 1 (None: cpu count), the hinted definitions that can't infer
+    anything are translated in that many forked processes (see pseudo_python.parallel)
+    '''
+    if profile:
+        from pseudo_python.profiler import Profile
+        profile = Profile()
+        translator = pseudo_python.ast_translator.ASTTranslator(pseudo_python.parser.parse(source), source, slotted, packed)
+        return profile.run(translator), profile
+    if cache is not None and not packed:
+        module = cache.get(source)
+        if module is None:
+            module = translate(source, jobs=jobs)
+            cache.put(source, module)
+        if slotted:
+            from pseudo_python.nodes import to_node
+            module = to_node(module)
+        return module
+    return pseudo_python.ast_translator.ASTTranslator(pseudo_python.parser.parse(source), source, slotted, packed, jobs).translate()
+
+def is_translatable(source):
+    '''
+    True if source can be translated to pseudo
+
+    no error message is formatted: use translate to see why it can't.
+    an internal error of the translator isn't an answer: it's raised
+    '''
+    try:
+        translate(source, packed=True)
+    except (pseudo_python.errors.PseudoError, SyntaxError):
+        return False
+    return True
+
+def translate_project(sources, jobs=1, targets=None, summaries=None):
+    '''
+    translate the modules of a project {module name: source}, importing each other
+
+    returns {module name: pseudo ast module} for the targets (default: all),
+    with summaries {module name: filename} the interfaces of the modules are
+    saved there and not translated again (see pseudo_python.project)
+    '''
+    import pseudo_python.project
+    return pseudo_python.project.translate_project(sources, jobs, targets, summaries)
+
+def translate_to_languages(source, languages, jobs=None, cache=None):
+    '''
+    translate source once and generate code for each of languages in parallel
+
+    returns {language: code}
+    '''
+    import pseudo_python.batch
+    outputs = {}
+    for language, output, error in pseudo_python.batch.generate_languages(translate(source, cache), languages, jobs):
+        if error is not None:
+            raise error
+        outputs[language] = output
+    return outputs
+
+def translate_to_yaml(source, cache=None):
+    return translate_to_format(source, 'yaml', cache)
+
+def translate_to_format(source, format='yaml', cache=None):
+    '''
+    translate source and serialize it as yaml, json or msgpack (bytes)
+    '''
+    import pseudo_python.serialization
+    return pseudo_python.serialization.dump(translate(source, cache), format)
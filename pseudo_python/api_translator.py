@@ -1,4 +1,4 @@
-from pseudo_python.builtin_typed_api import builtin_type_check
+from pseudo_python.builtin_typed_api import builtin_type_check, api_changed
 from pseudo_python.errors import PseudoPythonTypeCheckError
 
 class Standard:
@@ -185,3 +185,81 @@ OPERATOR_API = {
     }
 }
 
+
+class ApiIndex:
+    '''
+    resolves the (namespace, name, arity) of a call to the Standard of an api table
+    like FUNCTION_API with a single lookup
+
+    an overloaded {arity: Standard} entry is indexed for each of its arities,
+    any other entry for any arity (None)
+    '''
+
+    def __init__(self, table):
+        self.table = table
+        self._index = {}
+        self._names = {}
+        for namespace, api in table.items():
+            for name in api:
+                self._add(namespace, name)
+
+    def _add(self, namespace, name):
+        entry = self.table[namespace][name]
+        self._names.setdefault(namespace, set()).add(name)
+        if isinstance(entry, dict):
+            for arity, standard in entry.items():
+                self._index[(namespace, name, arity)] = standard
+        else:
+            self._index[(namespace, name, None)] = entry
+
+    def resolve(self, namespace, name, arity):
+        '''
+        the Standard for name with arity args or None
+        '''
+        standard = self._index.get((namespace, name, arity))
+        if standard is None:
+            standard = self._index.get((namespace, name, None))
+        return standard
+
+    def has(self, namespace, name):
+        return name in self._names.get(namespace, ())
+
+    def similar(self, namespace, name):
+        '''
+        the names of namespace close to name, the closest first
+        '''
+        import difflib
+        return difflib.get_close_matches(name, sorted(self._names.get(namespace, ())), 3)
+
+    def register(self, namespace, name, standard, arity=None):
+        '''
+        adds standard to the table and the index: for any arity,
+        replacing name, or as the overload of name for arity
+        '''
+        api = self.table.setdefault(namespace, {})
+        for key in [key for key in self._index if key[:2] == (namespace, name)]:
+            del self._index[key]
+        if arity is None:
+            api[name] = standard
+        else:
+            if not isinstance(api.get(name), dict):
+                api[name] = {}
+            api[name][arity] = standard
+        self._add(namespace, name)
+        api_changed()
+
+FUNCTION_INDEX = ApiIndex(FUNCTION_API)
+METHOD_INDEX = ApiIndex(METHOD_API)
+
+def register_function(namespace, name, standard, arity=None):
+    '''
+    translates namespace.name(..) (name(..) for the 'global' namespace) with standard,
+    its pseudo signature is added with builtin_typed_api.register_signature
+    '''
+    FUNCTION_INDEX.register(namespace, name, standard, arity)
+
+def register_method(type, name, standard, arity=None):
+    '''
+    translates receiver.name(..) with standard for receivers of the builtin type
+    '''
+    METHOD_INDEX.register(type, name, standard, arity)
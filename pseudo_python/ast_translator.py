@@ -1,9 +1,14 @@
 import ast
+import operator
+import sys
 import pseudo_python.env
 from pseudo_python.builtin_typed_api import TYPED_API, ORIGINAL_METHODS
 from pseudo_python.errors import PseudoPythonNotTranslatableError, PseudoPythonTypeCheckError, cant_infer_error, translation_error, type_check_error
-from pseudo_python.api_translator import Standard, StandardCall, StandardMethodCall, FUNCTION_API, METHOD_API, OPERATOR_API
-from pseudo_python.helpers import serialize_type, prepare_table
+from pseudo_python.api_translator import Standard, StandardCall, StandardMethodCall, FUNCTION_API, METHOD_API, OPERATOR_API, FUNCTION_INDEX, METHOD_INDEX
+from pseudo_python.helpers import serialize_type, prepare_table, did_you_mean
+from pseudo_python.inference import call_graph, components, on_new_stack, stack_depth
+from pseudo_python.nodes import node_key, to_node
+from pseudo_python.pseudo_types import Signature, make_type, new_signature
 
 BUILTIN_TYPES = {
     'int':      'Int',
@@ -72,11 +77,29 @@ PSEUDO_OPS = {
 }
 
 
+class PendingReturnType(Exception):
+    '''
+    a recursive call of a function whose return type isn't inferred yet:
+    the statement is translated again after the rest of its block
+    '''
+
+# _try_translate result for a statement raising PendingReturnType
+PENDING = object()
+
+# the _definition_index entry of the methods of an imported class: translated in its module
+IMPORTED = {}
+
 
 class ASTTranslator:
 
-    def __init__(self, tree, code):
+    def __init__(self, tree, code, slotted=False, packed=False, jobs=1, interfaces=None):
         self.tree = tree
+        self.slotted = slotted # build pseudo_python.nodes slotted nodes instead of dicts
+        self.packed = packed # packed_literal nodes for literal only lists, sets and dicts
+        self.jobs = jobs # worker processes for the independent definitions (None: cpu count)
+        # module as written in the imports ('a.b', '.b' for from .b import) -> its interface
+        # (see interface): the modules of the project imported by this one
+        self.interfaces = interfaces or {}
         self.in_class = False
         self.lines = [''] + code.split('\n') # easier 1based access with lineno
         self.type_env = pseudo_python.env.Env(dict(TYPED_API.items()), None)
@@ -95,17 +118,108 @@ class ASTTranslator:
         self._attrs = {}
         self._imports = set()
         self._typing_imports = set()
+        # imported name -> the project module defining it
+        self._imported = {}
+        # the modules of the project imported with import <module>
+        self._modules = set()
+        self._imported_classes = []
+        self._imported_exceptions = []
         self.current_class = None
-        self._tuple_assigned = []
-        self._tuple_used = []
+        # keys of the targets already assigned in the current tuple assignment
+        self._tuple_assigned = set()
+        # _old_ temporary name -> the node whose value it keeps, in order
+        self._tuple_used = {}
+        self._tuple_order = []
+        # (namespace, name) / 'main' -> definitions and constants used while translating it
+        self._dependencies = {}
+        # (namespace, name) -> the definition whose call inferred its arg types
+        self._inferred_by = {}
+        self._current_definition = None
+        # if a recursive call with an unknown return type raises PendingReturnType
+        # (only in a function body, which translates it again)
+        self._deferrable = False
+        # the nesting of _infer on the current stack
+        self._inferring = 0
         self.function_name = 'top level'
         self.type_env['functions'] = {}
         self._translate_top_level(self.tree)
-        self._translate_hinted_functions()
-        self._translate_pure_functions()
-        main = self._translate_main()
+        self._infer_definitions()
+        self._main_nodes = self._translate_main()
+        definitions = self._translate_definitions()
+        module = {'type': 'module', 'dependencies': self.dependencies, 'custom_exceptions': self.custom_exceptions, 'constants': self.constants, 'definitions': definitions, 'main': self._main_nodes}
+        return to_node(module) if self.slotted else module
+
+    def retranslate(self, tree, code, changed):
+        '''
+        retranslate only some function/method definitions of an already translated module
+
+        changed is a set of (namespace, name) keys of definitions whose body changed:
+        they are translated again, with the definitions whose arg types were inferred
+        from them, and then every definition depending on a signature that changed.
+
+        returns None if the edit needs a full translation:
+        if it reaches main or a constructor or leaves a definition uninferred
+        '''
+        self.tree = tree
+        self.lines = [''] + code.split('\n')
+        nodes = self._definition_nodes(tree)
+        before = {key: list(self.type_env.top[key[0]][key[1]]) for key in nodes}
+        done = set()
+        dirty = set(changed)
+        while dirty:
+            reset, frontier = set(), set(dirty)
+            while frontier:
+                frontier = {key for key, caller in self._inferred_by.items() if caller in frontier} - reset - dirty
+                reset |= frontier
+            if 'main' in dirty or any(key not in nodes or key[1] == '__init__' for key in dirty | reset):
+                return None
+
+            for key in dirty | reset:
+                namespace, name = key
+                self._definition_index[namespace][name] = nodes[key]
+                self._translated.get(namespace, set()).discard(name)
+                self._dependencies.pop(key, None)
+                self.type_env.top[namespace][name].reset(args=key in reset)
+
+            for key in nodes:
+                namespace, name = key
+                if key not in dirty or isinstance(self._definition_index[namespace][name], dict):
+                    continue
+                self._translate_hinted_fun(name, namespace)
+                if isinstance(self._definition_index[namespace][name], dict):
+                    continue
+                signature = self.type_env.top[namespace][name]
+                receiver = None if namespace == 'functions' else {'pseudo_type': namespace}
+                if len(signature) == 2:
+                    self._definition_index[namespace][name] = self._translate_function(nodes[key], namespace, receiver, name, [])
+                elif signature[1] is not None:
+                    self._definition_index[namespace][name] = self._translate_function(nodes[key], namespace, receiver, name, None)
+
+            done |= dirty | reset
+            untranslated = {key for key in done if not isinstance(self._definition_index[key[0]][key[1]], dict)}
+            changed_signatures = {key for key in nodes if self.type_env.top[key[0]][key[1]] != before[key]}
+            dirty = {key for key, dependencies in self._dependencies.items() if dependencies & (changed_signatures | untranslated)} - done
+            if untranslated and not dirty:
+                return None
+
+        self.retranslated = done
         definitions = self._translate_definitions()
-        return {'type': 'module', 'dependencies': self.dependencies, 'custom_exceptions': self.custom_exceptions, 'constants': self.constants, 'definitions': definitions, 'main': main}
+        return {'type': 'module', 'dependencies': self.dependencies, 'custom_exceptions': self.custom_exceptions, 'constants': self.constants, 'definitions': definitions, 'main': self._main_nodes}
+
+    def _definition_nodes(self, tree):
+        nodes = {}
+        for n in tree.body:
+            if isinstance(n, ast.FunctionDef):
+                nodes[('functions', n.name)] = n
+            elif isinstance(n, ast.ClassDef) and n.name not in self._exceptions:
+                for m in n.body:
+                    if isinstance(m, ast.FunctionDef):
+                        nodes[(n.name, m.name)] = m
+        return nodes
+
+    def _depend(self, key):
+        if self._current_definition is not None:
+            self._dependencies.setdefault(self._current_definition, set()).add(key)
 
     def _translate_definitions(self):
         definitions = []
@@ -141,7 +255,11 @@ class ASTTranslator:
     def _translate_main(self):
         self.current_class = None
         self.function_name = 'global scope'
-        return self._translate_node(self.main)
+        self._current_definition = 'main'
+        self._dependencies['main'] = set()
+        main = self._translate_node(self.main)
+        self._current_definition = None
+        return main
 
     def _translate_top_level(self, node):
         nodes = node.body
@@ -151,6 +269,14 @@ class ASTTranslator:
             if isinstance(n, ast.Import):
                 if self.definitions or self.main:
                     raise translation_error('imports can be only on top', (n.lineno, n.col_offset), self.lines[n.lineno])
+                if n.names[0].name in self.interfaces:
+                    for al in n.names:
+                        if al.asname or al.name not in self.interfaces:
+                            raise translation_error('only import <module> of the project supported', (n.lineno, n.col_offset), self.lines[n.lineno])
+                        self._import_interface(self.interfaces[al.name], None, n)
+                        self._modules.add(al.name) # import a.b: a.b.<name> through the attrs of a
+                        self.type_env.top[al.name.partition('.')[0]] = 'module'
+                    continue
 
                 self._imports.add(n.names[0].name)
                 self.type_env.top['_%s' % n.names[0].name], self.type_env.top[n.names[0].name] = self.type_env.top[n.names[0].name], 'library'
@@ -158,18 +284,33 @@ class ASTTranslator:
             elif isinstance(n, ast.ImportFrom):
                 if self.definitions or self.main:
                     raise translation_error('imports can be only on top', (n.lineno, n.col_offset), self.lines[n.lineno])
+                module = '.' * n.level + (n.module or '')
+                prefix = module if n.module is None else module + '.'
+                submodules = [al.name for al in n.names if prefix + al.name in self.interfaces]
+                if (module in self.interfaces or submodules) and not any(al.asname for al in n.names):
+                    for name in submodules: # from a import b of a package a: b.<name>
+                        self._import_interface(self.interfaces[prefix + name], None, n)
+                        self.type_env.top[name] = 'module'
+                    names = None if n.names[0].name == '*' else [al.name for al in n.names if al.name not in submodules]
+                    if names is None or names:
+                        if module not in self.interfaces:
+                            raise translation_error('%s is not a module of the project' % module, (n.lineno, n.col_offset), self.lines[n.lineno])
+                        self._import_interface(self.interfaces[module], names, n)
+                    continue
                 if n.module != 'typing' or any(al.asname for al in n.names):
                     raise translation_error('only import <x> and from typing import <type>.. supported', (n.lineno, n.col_offset), self.lines[n.lineno])
 
                 self._typing_imports |= {al.name for al in n.names}
 
             elif isinstance(n, ast.FunctionDef):
+                self._check_not_imported(n.name, n)
                 self.definitions.append(('function', n.name))
                 self._definition_index['functions'][n.name] = n
-                self.type_env.top['functions'][n.name] = ['Function'] + ([None] * len(n.args.args)) + [None]
+                self.type_env.top['functions'][n.name] = new_signature(len(n.args.args))
                 self.type_env.top[n.name] = self.type_env.top['functions'][n.name]
             elif isinstance(n, ast.ClassDef):
                 self.assert_translatable('class', decorator_list=([], n.decorator_list))
+                self._check_not_imported(n.name, n)
                 self._hierarchy[n.name] = (None, set())
                 if n.bases:
                     if len(n.bases) == 1 and isinstance(n.bases[0], ast.Name) and n.bases[0].id in self._exceptions:
@@ -213,7 +354,7 @@ class ASTTranslator:
 
                         self.definitions[-1][3].append(m.name)
                         self._definition_index[n.name][m.name] = m
-                        self.type_env.top[n.name][m.name] = ['Function'] + ([None] * (len(m.args.args) - 1)) + [None]
+                        self.type_env.top[n.name][m.name] = new_signature(len(m.args.args) - 1)
                     else:
                         raise translation_error('only methods are supported in classes',
                             (m.lineno, m.col_offset),
@@ -243,7 +384,9 @@ class ASTTranslator:
                         self.lines[n.targets[0].lineno])
 
                 else:
+                    self._check_not_imported(n.targets[0].id, n)
                     self.current_constant = n.targets[0].id
+                    self._check_literal(n.value)
                     init = self._translate_node(n.value)
                     self.constants.append({
                         'type': 'constant',
@@ -257,25 +400,92 @@ class ASTTranslator:
                 self.current_constant = None
                 self.main.append(n)
 
-    def _translate_node(self, node, in_call=False):
-        if isinstance(node, ast.AST):
-            if self.current_constant and type(node) not in [ast.Num, ast.Str, ast.List]:
-                raise translation_error(
-                    'You can initialize constants only with literals',
-                    (node[0].lineno, node[0].col_offset),
-                    self.lines[node[0].lineno],
-                    right='K = [2, 4]',
-                    wrong='K = [2, x]')
-
-            fields = {field: getattr(node, field) for field in node._fields}
-            l = getattr(node, 'lineno', None)
-            if l:
-                fields['location'] = l, node.col_offset
+    def _import_interface(self, interface, names, node):
+        '''
+        define the names (None: all) of an imported module of the project with its interface:
+        with all its classes and exceptions, so the types in its signatures are known
+
+        pseudo has one namespace: the imported names can't be defined again
+        '''
+        for c in interface['classes']:
+            if self._imported.get(c['name']) == c['module']: # imported through another module
+                continue
+            self._import_name(c['name'], c['module'], node)
+            self.type_env.top[c['name']] = {label: Signature(list(signature)) for label, signature in c['methods'].items()}
+            self._attr_index[c['name']] = {label: [dict(attr), inherited] for label, (attr, inherited) in c['attrs'].items()}
+            self._attrs[c['name']] = []
+            self._hierarchy[c['name']] = (c['base'], set())
+            if c['base'] is not None:
+                self._hierarchy[c['base']][1].add(c['name'])
+            self._definition_index[c['name']] = {label: IMPORTED for label in c['methods']}
+            self._imported_classes.append(c)
+        for name, module in interface['exceptions']:
+            if self._imported.get(name) != module:
+                self._import_name(name, module, node)
+                self._exceptions.add(name)
+                self.type_env.top[name] = 'ExceptionType'
+                self._imported_exceptions.append([name, module])
+
+        for name in (interface['functions'] if names is None else names):
+            if name in interface['functions']:
+                self._import_name(name, interface['module'], node)
+                self.type_env.top[name] = Signature(list(interface['functions'][name]))
+        for name in (interface['constants'] if names is None else names):
+            if name in interface['constants']:
+                self._import_name(name, interface['module'], node)
+                self.type_env.top[name] = interface['constants'][name]
+        for name in names or []:
+            if self._imported.get(name) is None:
+                raise translation_error('%s doesn\'t define %s' % (interface['module'], name), (node.lineno, node.col_offset), self.lines[node.lineno])
+
+    def _import_name(self, name, module, node):
+        if self._imported.get(name, module) != module or name not in self._imported and self.type_env.top[name] is not None:
+            raise translation_error('%s from %s is already defined' % (name, module), (node.lineno, node.col_offset), self.lines[node.lineno])
+        self._imported[name] = module
+
+    def _check_not_imported(self, name, node):
+        if name in self._imported:
+            raise translation_error('%s is already imported from %s' % (name, self._imported[name]), (node.lineno, node.col_offset), self.lines[node.lineno])
+
+    def interface(self, module):
+        '''
+        what the modules importing this translated module (named module) know about it:
+        the signatures of its functions, the types of its constants and its classes
+        (their method signatures and attrs) and exceptions, with the imported ones
+        '''
+        functions = {}
+        classes = list(self._imported_classes)
+        for definition in self.definitions:
+            if definition[0] == 'function':
+                functions[definition[1]] = list(self.type_env.top['functions'][definition[1]])
             else:
-                fields['location'] = None
-            if isinstance(node, ast.Attribute):
-                fields['in_call'] = in_call
-            return getattr(self, '_translate_%s' % type(node).__name__.lower())(**fields)
+                classes.append({
+                    'name': definition[1],
+                    'module': module,
+                    'base': definition[2],
+                    'methods': {label: list(signature) for label, signature in self.type_env.top[definition[1]].items()},
+                    'attrs': {label: [dict(attr), inherited] for label, (attr, inherited) in self._attr_index[definition[1]].items()}
+                })
+        return {
+            'module': module,
+            'functions': functions,
+            'constants': {constant['constant']: constant['pseudo_type'] for constant in self.constants},
+            'classes': classes,
+            'exceptions': self._imported_exceptions + [[e['name'], module] for e in self.custom_exceptions]
+        }
+
+    # ast node type -> function(translator, node, in_call) calling its _translate_ method,
+    # built with the class (see _dispatch_table)
+    _dispatch = {}
+
+    def _translate_node(self, node, in_call=False):
+        dispatch = self._dispatch.get(type(node))
+        if dispatch is not None:
+            result = dispatch(self, node, in_call)
+            return to_node(result) if self.slotted else result
+        elif isinstance(node, ast.AST):
+            line = getattr(node, 'lineno', None)
+            raise translation_error('%s is not supported' % type(node).__name__, (line, node.col_offset) if line else None, self.lines[line] if line else '')
         elif isinstance(node, list):
             results = []
             for n in node:
@@ -290,6 +500,47 @@ class ASTTranslator:
         else:
             return node
 
+    def _try_translate(self, node):
+        '''
+        _translate_node or PENDING: then the names bound by the abandoned attempt
+        are unbound, so translating node again sees the same env
+        '''
+        if not self._deferrable: # nothing raises PendingReturnType
+            return self._translate_node(node)
+        env, values = self.type_env, dict(self.type_env.values)
+        try:
+            return self._translate_node(node)
+        except PendingReturnType:
+            self.type_env = env
+            for name in [name for name in env.values if name not in values]:
+                del env.values[name]
+            env.values.update(values)
+            self._tuple_assigned, self._tuple_used, self._tuple_order = set(), {}, []
+            return PENDING
+
+    def _tuple_temporary(self, name, node):
+        '''
+        node was assigned earlier in the current tuple assignment:
+        its old value is read from the name local, assigned before the tuple
+        '''
+        if name not in self._tuple_used:
+            self._tuple_used[name] = node
+            self._tuple_order.append(name)
+        return {'type': 'local', 'name': name, 'pseudo_type': node['pseudo_type']}
+
+    def _check_literal(self, node):
+        nodes = [node]
+        for child in nodes: # breadth first, like ast.walk
+            if isinstance(child, ast.List):
+                nodes.extend(child.elts)
+            elif not isinstance(child, (ast.Num, ast.Str)):
+                raise translation_error(
+                    'You can initialize constants only with literals',
+                    (child.lineno, child.col_offset),
+                    self.lines[child.lineno],
+                    right='K = [2, 4]',
+                    wrong='K = [2, x]')
+
     def _translate_num(self, n, location):
         type = 'int' if isinstance(n, int) else 'float'
         return {'type': type, 'value': n, 'pseudo_type': type.title()}
@@ -304,6 +555,8 @@ class ASTTranslator:
             id_type = self.type_env.top[id]
             if isinstance(id_type, dict): # class
                 id_type = id
+            else:
+                self._depend(('constants', id))
             return {'type': 'typename', 'name': id, 'pseudo_type': id_type}
         else:
             id_type = self.type_env[id]
@@ -315,14 +568,14 @@ class ASTTranslator:
 
             # if isinstance(id_type, list):
             # id_type = tuple(['Function'] + id_type)
+            if id_type is self.type_env.top['functions'].get(id):
+                self._depend(('functions', id))
             if id == 'self':
                 return {'type': 'this', 'pseudo_type': id_type}
             else:
                 z = {'type': 'local', 'name': id, 'pseudo_type': id_type}
-                if z in self._tuple_assigned:
-                    if not any(a[0] == '_old_%s' % id for a in self._tuple_used):
-                        self._tuple_used.append(('_old_%s' % id, z))
-                    z = {'type': 'local', 'name': '_old_%s' % id, 'pseudo_type': id_type}
+                if self._tuple_assigned and node_key(z) in self._tuple_assigned:
+                    z = self._tuple_temporary('_old_%s' % id, z)
                 return z
 
     def _translate_call(self, func, args, keywords, starargs=None, kwargs=None, location=None):
@@ -384,13 +637,13 @@ class ASTTranslator:
                 arg_nodes = [self._translate_node(args[0].args.args[0], in_call=True)]
 
             if args[0].func.id == 'map':
-                return_type = ['List', arg_nodes[0]['pseudo_type'][-1]]
+                return_type = make_type('List', arg_nodes[0]['pseudo_type'][-1])
             else:
                 if arg_nodes[0]['pseudo_type'][-1] != 'Boolean':
                     l = {'type': 'local', 'name': args[0].args[0].args.args[0].arg, 'pseudo_type': arg_nodes['pseudo_type'][-1]}
                     arg_nodes[0] = {
                         'type': 'anonymous_function',
-                        'pseudo_type': ['Function', arg_nodes['pseudo_type'][-1], 'Boolean'],
+                        'pseudo_type': make_type('Function', arg_nodes['pseudo_type'][-1], 'Boolean'),
                         'return_type': 'Boolean',
                         'params': [l],
                         'block': [self._testable({
@@ -401,7 +654,7 @@ class ASTTranslator:
                         })]
                     }
         
-                return_type = ['List', 'Boolean']
+                return_type = make_type('List', 'Boolean')
             return {
                 'type': 'standard_method_call',
                 'receiver': receiver_node,
@@ -418,7 +671,7 @@ class ASTTranslator:
                         suggestions='please use {} notation if a set has elements')
                 return {
                     'type': 'set',
-                    'pseudo_type': ['Set', None],
+                    'pseudo_type': make_type('Set', None),
                     'elements': []
                 }
 
@@ -434,7 +687,7 @@ class ASTTranslator:
                 else:
                     arg_node = self._translate_node(args[0])
                     if func.id != 'sum':
-                        if arg_node['pseudo_type'] != ['List', 'Boolean']:
+                        if arg_node['pseudo_type'] != make_type('List', 'Boolean'):
                             raise type_check_error('%s expected List[Boolean]' % func.id,
                                 location,
                                 self.lines[location[0]],
@@ -448,7 +701,7 @@ class ASTTranslator:
                             'pseudo_type': 'Boolean'
                         }
                     else:
-                        if arg_node['pseudo_type'] != ['List', 'Int'] and arg_node['pseudo_type'] != ['List', 'Float']:
+                        if arg_node['pseudo_type'] != make_type('List', 'Int') and arg_node['pseudo_type'] != make_type('List', 'Float'):
                             raise type_check_error('%s expected List[Int] / List[Float]' % func.id,
                                 location,
                                 self.lines[location[0]],
@@ -466,7 +719,7 @@ class ASTTranslator:
                                 'params': [
                                     {'type': 'local', 'name': 'memo', 'pseudo_type': _type},
                                     {'type': 'local', 'name': 'value', 'pseudo_type': _type}],
-                                'pseudo_type': ['Function', _type, _type, _type],
+                                'pseudo_type': make_type('Function', _type, _type, _type),
                                 'return_type': _type,
                                 'block': [{
                                     'type': 'binary_op',
@@ -541,16 +794,20 @@ class ASTTranslator:
                 location,
                 self.lines[location[0]])
 
+        self._depend((name, '__init__'))
         if init:
-            self._definition_index[name]['__init__'] = self._translate_function(self._definition_index[name]['__init__'], name, {'pseudo_type': name}, '__init__', [p['pseudo_type'] for p in params])
-            init[-1] = name
+            if isinstance(self._definition_index[name]['__init__'], dict): # constructed before
+                self._type_check(name, '__init__', [p['pseudo_type'] for p in params])
+            else:
+                self._definition_index[name]['__init__'] = self._infer(self._definition_index[name]['__init__'], name, {'pseudo_type': name}, '__init__', [p['pseudo_type'] for p in params])
+                init.set_return_type(name)
 
         for label, m in self._definition_index[name].items():
             self._translate_hinted_fun(label, name)
 
         for label, m in self._definition_index[name].items():
-            if len(self.type_env.top[name][label]) == 2 and label != '__init__':
-                self._definition_index[name][label] = self._translate_function(m, name, {'pseudo_type': name}, label, [])
+            if len(self.type_env.top[name][label]) == 2 and label != '__init__' and not isinstance(m, dict):
+                self._definition_index[name][label] = self._infer(m, name, {'pseudo_type': name}, label, [])
 
         return {
             'type': 'new_instance',
@@ -560,12 +817,15 @@ class ASTTranslator:
         }
 
     def _translate_real_method_call(self, node_type, z, receiver, message, params, location):
+        self._depend((z, message))
         c = self.type_env.top[z]
         param_types = [param['pseudo_type'] for param in params]
         if message in c and len(c[message]) == 2 or len(c[message]) > 2 and c[message][1]:
             q = self._type_check(z, message, param_types)[-1]
+            if q is None and self._deferrable and (z, message) == self._current_definition:
+                raise PendingReturnType('%s#%s' % (z, message))
         else:
-            self._definition_index[z][message] = self._translate_function(self._definition_index[z][message], z, receiver, message, param_types)
+            self._definition_index[z][message] = self._infer(self._definition_index[z][message], z, receiver, message, param_types)
             q = c[message][-1]
 
         if node_type == 'call':
@@ -586,54 +846,49 @@ class ASTTranslator:
             raise translation_error(
                 "pseudo-python doesn't support %s" % namespace,
                 location, self.lines[location[0]],
-                suggestions='pseudo-python supports methods from\n  %s' % ' '.join(
+                namespace=namespace,
+                suggestions=lambda: 'pseudo-python supports methods from\n  %s' % ' '.join(
                   k for k in FUNCTION_API if k != 'global'))
-        api = FUNCTION_API[namespace].get(function)
-        if not api:
+        api = FUNCTION_INDEX.resolve(namespace, function, len(args))
+        if api is None:
+            if FUNCTION_INDEX.has(namespace, function):
+                raise translation_error(
+                    'pseudo-python doesn\'t support %s%s with %d args' % (namespace, function, len(args)),
+                    location, self.lines[location[0]])
             raise translation_error(
                 'pseudo-python doesn\'t support %s %s' % (namespace, function),
                 location, self.lines[location[0]],
-                suggestions='pseudo-python supports those %s functions\n  %s' % (
+                namespace=namespace,
+                suggestions=lambda: '%spseudo-python supports those %s functions\n  %s' % (
+                    did_you_mean(FUNCTION_INDEX.similar(namespace, function)),
                     namespace,
                     prepare_table(TYPED_API[namespace], ORIGINAL_METHODS.get(namespace)).strip()))
-
-
-        if not isinstance(api, dict):
-            return api.expand(args)
-        else:
-            for count,(a, b)  in api.items():
-                if len(args) == count:
-                    return b.expand(args)
-            raise translation_error(
-                'pseudo-python doesn\'t support %s%s with %d args' % (namespace, function, len(args)),
-                location, self.lines[location[0]])
+        return api.expand(args)
 
     def _translate_builtin_method_call(self, class_type, base, message, args, location):
         if class_type not in METHOD_API:
             raise translation_error(
                 "pseudo-python doesn't support %s" % class_type,
                 location,self.lines[location[0]],
-                suggestions='pseudo-python support those builtin classes:\n%s' % ' '.join(
+                namespace=class_type,
+                suggestions=lambda: 'pseudo-python support those builtin classes:\n%s' % ' '.join(
                     PSEUDON_BUILTIN_TYPES[k] for k in METHOD_API.keys()))
 
-        api = METHOD_API.get(class_type, {}).get(message)
-        if not api:
+        api = METHOD_INDEX.resolve(class_type, message, len(args))
+        if api is None:
+            if METHOD_INDEX.has(class_type, message):
+                raise translation_error(
+                    'pseudo-python doesn\'t support %s%s with %d args' % (serialize_type(class_type), message, len(args)),
+                    location, self.lines[location[0]])
             raise translation_error(
                 "pseudo-python doesn\'t support %s#%s"  % (serialize_type(class_type), message),
                 location, self.lines[location[0]],
-                suggestions='pseudo-python supports those %s methods:\n%s' % (
+                namespace=class_type,
+                suggestions=lambda: '%spseudo-python supports those %s methods:\n%s' % (
+                    did_you_mean(METHOD_INDEX.similar(class_type, message)),
                     PSEUDON_BUILTIN_TYPES[class_type],
                     prepare_table(TYPED_API[class_type], ORIGINAL_METHODS.get(class_type)).strip()))
-
-        if isinstance(api, Standard):
-            return api.expand([base] + args)
-        else:
-            for count, b  in api.items():
-                if len(args) == count:
-                    return b.expand([base] + args)
-            raise translation_error(
-                'pseudo-python doesn\'t support %s%s with %d args' % (serialize_type(class_type), message, len(args)),
-                location, self.lines[location[0]])
+        return api.expand([base] + args)
 
     def _translate_function(self, node, z, receiver, name, args):
         self.assert_translatable('functiondef',
@@ -655,12 +910,14 @@ class ASTTranslator:
         if args != [] and name in self._translated[z]: # self.type_env.top[z][name][1]:
             raise type_check_error(
                 'please move recursion in a next branch in %s' % node.name,
-                location, self.lines[location[0]],
+                (node.lineno, node.col_offset), self.lines[node.lineno],
                 suggestions='pseudo-python will detect non-recursive branches after the first one in v0.3',
                 right='def lala(e):\n    if e == 0:\n        return 0\n   else:\n        return lala(e - 2)',
                 wrong='def lala(e):\n    if e > 0:\n        return lala(e - 2)\n..')
 
         self._translated[z].add(name)
+        if args is not None:
+            self._inferred_by[(z, name)] = self._current_definition
 
         if args is not None:
             env = {a.arg: type for a, type in zip(node_args, args)}
@@ -671,24 +928,53 @@ class ASTTranslator:
             env['self'] = receiver['pseudo_type']
         self.type_env, old_type_env = self.type_env.top.child_env(env), self.type_env
         if args is not None:
-            self.type_env.top[z][name][1:-1] = args
+            self.type_env.top[z][name].set_args(args)
 
         outer_current_class, self.current_class = self.current_class, z
         outer_function_name, self.function_name = self.function_name, name
+        outer_definition, self._current_definition = self._current_definition, (z, name)
+        outer_deferrable, self._deferrable = self._deferrable, True
+        self._dependencies[(z, name)] = set()
 
-        children = []
+        blocks = []
+        pending = []
         self.is_last = False
         for j, child in enumerate(node.body):
             if j == len(node.body) - 1:
                 self.is_last = True
-            child_ = self._translate_node(child)
+            blocks.append(self._try_translate(child))
+            if blocks[-1] is PENDING:
+                pending.append(j)
+            # print(args);input()
+
+        # a recursive call before the return type is known: translate the
+        # pending statements again while that infers more return types,
+        # then one last time with the unknown ones
+        while pending:
+            still_pending = []
+            for j in pending:
+                self.is_last = j == len(node.body) - 1
+                blocks[j] = self._try_translate(node.body[j])
+                if blocks[j] is PENDING:
+                    still_pending.append(j)
+            if len(still_pending) == len(pending):
+                self._deferrable = False
+                for j in still_pending:
+                    self.is_last = j == len(node.body) - 1
+                    blocks[j] = self._translate_node(node.body[j])
+                still_pending = []
+            pending = still_pending
+
+        children = []
+        for child_ in blocks:
             if isinstance(child_, list):
                 children.extend(child_)
             else:
                 children.append(child_)
-            # print(args);input()
         self.function_name = outer_function_name
         self.current_class = outer_current_class
+        self._current_definition = outer_definition
+        self._deferrable = outer_deferrable
 
         self.type_env = old_type_env
 
@@ -726,7 +1012,7 @@ class ASTTranslator:
             raise type_check_error(
                 "expected %s return type for %s" % (serialize_type(whiplash[-1]), self.function_name), location, self.lines[location[0]], wrong_type=value_node['pseudo_type'])
         elif whiplash[-1] is None:
-            whiplash[-1] = value_node['pseudo_type']
+            whiplash.set_return_type(value_node['pseudo_type'])
 
         return {
             'type': 'explicit_return' if not self.is_last else 'implicit_return',
@@ -735,8 +1021,21 @@ class ASTTranslator:
         }
 
     def _translate_binop(self, op, left, right, location):
+        # a left associative chain (a + b - c ..) is a left deep tree:
+        # fold it in a loop instead of recursing for each operation
+        chain = [(op, right, location)]
+        while isinstance(left, ast.BinOp):
+            chain.append((left.op, left.right, (left.lineno, left.col_offset) if hasattr(left, 'lineno') else None))
+            left = left.left
+        left_node = self._translate_node(left)
+        for op, right, location in reversed(chain):
+            left_node = self._translate_binary(op, left_node, self._translate_node(right), location)
+            if self.slotted:
+                left_node = to_node(left_node)
+        return left_node
+
+    def _translate_binary(self, op, left_node, right_node, location):
         op = PSEUDO_OPS[type(op)]
-        left_node, right_node = self._translate_node(left), self._translate_node(right)
         binop_type = TYPED_API['operators'][op](left_node['pseudo_type'], right_node['pseudo_type'])[-1]
         if binop_type == 'Float' or binop_type == 'Int':
             if op == '**': # math:pow(left, right)
@@ -881,6 +1180,8 @@ class ASTTranslator:
                 'right': right_node,
                 'pseudo_type': left_node['pseudo_type']
             }
+            if self.slotted: # convert the left deep result while it grows
+                result = to_node(result)
         return result
 
     def _translate_in(self, element, sequence, location):
@@ -945,6 +1246,8 @@ class ASTTranslator:
                     },
                     'pseudo_type': 'Boolean'
                 }
+                if self.slotted:
+                    result = to_node(result)
             return result
 
     def _confirm_index(self, index_type, expected, location, window):
@@ -960,7 +1263,7 @@ class ASTTranslator:
             raise type_check_error(
                 '%s not comparable with %s' % (serialize_type(l), serialize_type(r)),
                 location, self.lines[location[0]],
-                suggestions='comparable types in pseudo-python: %s' % ' '.join(COMPARABLE_TYPES))
+                suggestions=lambda: 'comparable types in pseudo-python: %s' % ' '.join(COMPARABLE_TYPES))
 
     def _translate_attribute(self, value, attr, ctx, location, in_call=False):
         value_node = self._translate_node(value)
@@ -972,14 +1275,21 @@ class ASTTranslator:
                 right='h = H()\nh.y',
                 wrong='h = (2, H())\nh.hm')
 
-        if value_node['pseudo_type'] == 'library':
+        if value_node['pseudo_type'] == 'module': # a module of the project: its names are defined here too
+            module = '%s.%s' % (value_node['name'], attr)
+            if any(m == module or m.startswith(module + '.') for m in self._modules): # a.b of import a.b
+                return {'type': 'local', 'name': module, 'pseudo_type': 'module'}
+            if self._imported.get(attr) is None:
+                raise translation_error('%s doesn\'t define %s' % (value_node['name'], attr), location, self.lines[location[0]])
+            return self._translate_name(attr, ctx, location)
+        elif value_node['pseudo_type'] == 'library':
             if value_node['name'] == 'sys' and attr == 'argv':
                 return {
                     'type': 'standard_call',
                     'namespace': 'system',
                     'function': 'args',
                     'args': [],
-                    'pseudo_type': ['List', 'String'],
+                    'pseudo_type': make_type('List', 'String'),
                     'special': None
                 }
             else:
@@ -1005,13 +1315,15 @@ class ASTTranslator:
                 if not m:
                     value_type = value_node['pseudo_type']
                     value_general_type = self._general_type(value_type)
-                    show_type = serialize_type(TYPED_API.get('_generic_%s' % value_general_type, value_type))
+                    methods = self.type_env.top[value_general_type]
                     raise translation_error(
                         "pseudo-python can\'t infer the type of %s#%s"  % (serialize_type(value_type), attr),
                         location, self.lines[location[0]],
-                        suggestions='pseudo-python knows about those %s methods:\n%s' % (
-                            show_type,
-                            prepare_table(self.type_env.top[value_general_type], ORIGINAL_METHODS.get(value_general_type))))
+                        namespace=value_general_type,
+                        suggestions=lambda: '%spseudo-python knows about those %s methods:\n%s' % (
+                            did_you_mean(METHOD_INDEX.similar(value_general_type, attr)),
+                            serialize_type(TYPED_API.get('_generic_%s' % value_general_type, value_type)),
+                            prepare_table(methods or {}, ORIGINAL_METHODS.get(value_general_type))))
 
             else:
                 attr_type = attr_type[0]['pseudo_type']
@@ -1022,12 +1334,8 @@ class ASTTranslator:
                     'name': attr,
                     'pseudo_type': attr_type
                 }
-                if result in self._tuple_assigned:
-                    if not any(a[0] == '_old_self_%s' % attr for a in self._tuple_used):
-                        self._tuple_used.append(('_old_self_%s' % attr, result))
-
-
-                    result = {'type': 'local', 'name': '_old_self_%s' % attr, 'pseudo_type': attr_type}
+                if self._tuple_assigned and node_key(result) in self._tuple_assigned:
+                    result = self._tuple_temporary('_old_self_%s' % attr, result)
                 return result
             else:
                 result = {
@@ -1036,10 +1344,8 @@ class ASTTranslator:
                     'attr': attr,
                     'pseudo_type': attr_type
                 }
-                if result in self._tuple_assigned:
-                    if not any(a[0] == '_old_%s' % attr for a in self._tuple_used):
-                        self._tuple_used.append(('_old_%s' % attr, result))
-                    result = {'type': 'local', 'name': '_old_%s' % attr, 'pseudo_type': attr_type}
+                if self._tuple_assigned and node_key(result) in self._tuple_assigned:
+                    result = self._tuple_temporary('_old_%s' % attr, result)
                 return result
 
     def _translate_assign(self, targets, value, location):
@@ -1064,21 +1370,23 @@ class ASTTranslator:
             for t, child in zip(targets[0].elts, value.elts):
                 child_node = self._translate_node(child)
                 x = self._translate_node(t)
-                for a in self._tuple_used[u:]:
+                for name in self._tuple_order[u:]:
+                    old = self._tuple_used[name]
                     used.append({
                         'type': 'assignment',
-                        'target': {'type': 'local', 'name': a[0], 'pseudo_type': a[1]['pseudo_type']},
-                        'value': a[1],
+                        'target': {'type': 'local', 'name': name, 'pseudo_type': old['pseudo_type']},
+                        'value': old,
                         'pseudo_type': 'Void'
                     })
-                    self.type_env[a[0]] = a[1]['pseudo_type']
-                u = len(self._tuple_used)
+                    self.type_env[name] = old['pseudo_type']
+                u = len(self._tuple_order)
                 rights.append(
                     self._translate_assign([t], child_node, location))
-                self._tuple_assigned.append(rights[-1]['target'])
+                self._tuple_assigned.add(node_key(rights[-1]['target']))
 
-            self._tuple_assigned = []
-            self._tuple_used = []
+            self._tuple_assigned = set()
+            self._tuple_used = {}
+            self._tuple_order = []
             return used + rights
 
         elif isinstance(targets[0], ast.Name):
@@ -1172,28 +1480,47 @@ class ASTTranslator:
         return self._translate_assign([target], ast.BinOp(target, op, value), location)
 
     def _translate_if(self, test, orelse, body, location, base=True):
-        test_node = self._testable(self._translate_node(test))
-        block = self._translate_node(body)
-        #block [self._translate_node(child) for child in body]
-        if orelse and len(orelse) == 1 and isinstance(orelse[0], ast.If):
-            otherwise = self._translate_if(orelse[0].test, orelse[0].orelse, orelse[0].body, location, False)
-        elif orelse:
+        # an elif chain is a chain of ifs nested in orelse:
+        # translate the branches in a loop and link them from the last one
+        # a branch with a pending recursive call is translated after the others
+        branches = []
+        while True:
+            test_node = self._testable(self._translate_node(test))
+            branches.append((test_node, body, self._try_translate(body)))
+            #block [self._translate_node(child) for child in body]
+            if orelse and len(orelse) == 1 and isinstance(orelse[0], ast.If):
+                test, body, orelse = orelse[0].test, orelse[0].body, orelse[0].orelse
+            else:
+                break
+
+        if orelse:
             otherwise = {
                 'type': 'else_statement',
-                'block': self._translate_node(orelse),
+                'block': self._try_translate(orelse),
                 #block [self._translate_node(node) for node in orelse],
                 'pseudo_type': 'Void'
             }
         else:
             otherwise = None
 
-        return {
-            'type': 'if_statement' if base else 'elseif_statement',
-            'test': test_node,
-            'block': block,
-            'pseudo_type': 'Void',
-            'otherwise': otherwise
-        }
+        for j, (test_node, body, block) in enumerate(branches):
+            if block is PENDING:
+                branches[j] = test_node, body, self._translate_node(body)
+        if otherwise and otherwise['block'] is PENDING:
+            otherwise['block'] = self._translate_node(orelse)
+
+        for j in range(len(branches) - 1, -1, -1):
+            test_node, _, block = branches[j]
+            otherwise = {
+                'type': 'if_statement' if base and j == 0 else 'elseif_statement',
+                'test': test_node,
+                'block': block,
+                'pseudo_type': 'Void',
+                'otherwise': otherwise
+            }
+            if self.slotted and j:
+                otherwise = to_node(otherwise)
+        return otherwise
 
     def _translate_while(self, body, test, orelse, location):
         self.assert_translatable('while', orelse=([], orelse))
@@ -1279,19 +1606,27 @@ class ASTTranslator:
 
     def _translate_list(self, elts, ctx, location):
         if not elts:
-            return {'type': 'list', 'elements': [], 'pseudo_type': ['List', None]}
+            return {'type': 'list', 'elements': [], 'pseudo_type': make_type('List', None)}
+        elif self.packed:
+            packed = self._packed_literal('list', elts)
+            if packed:
+                return packed
 
         element_nodes, element_type = self._translate_elements(elts, 'list')
 
         return {
             'type': 'list',
-            'pseudo_type': ['List', element_type],
+            'pseudo_type': make_type('List', element_type),
             'elements': element_nodes
         }
 
     def _translate_dict(self, keys, values, location):
         if not keys:
-            return {'type': 'dictionary', 'pairs': [], 'pseudo_type': ['Dictionary', None, None]}
+            return {'type': 'dictionary', 'pairs': [], 'pseudo_type': make_type('Dictionary', None, None)}
+        elif self.packed:
+            packed = self._packed_literal('dictionary', values, keys)
+            if packed:
+                return packed
 
         pairs = [{'type': 'pair', 'key': self._translate_node(keys[0]), 'value': self._translate_node(values[0])}]
         key_type, value_type = pairs[0]['key']['pseudo_type'], pairs[0]['value']['pseudo_type']
@@ -1302,16 +1637,20 @@ class ASTTranslator:
 
         return {
             'type': 'dictionary',
-            'pseudo_type': ['Dictionary', key_type, value_type],
+            'pseudo_type': make_type('Dictionary', key_type, value_type),
             'pairs': pairs
         }
 
     def _translate_set(self, elts, location):
+        if self.packed:
+            packed = self._packed_literal('set', elts)
+            if packed:
+                return packed
         element_nodes, element_type = self._translate_elements(elts, 'set')
 
         return {
             'type': 'set',
-            'pseudo_type': ['Set', element_type],
+            'pseudo_type': make_type('Set', element_type),
             'elements': element_nodes
         }
 
@@ -1319,10 +1658,38 @@ class ASTTranslator:
         element_nodes, accidentaly_homogeneous, element_type = self._translate_elements(elts, 'tuple', homogeneous=False)
         return {
             'type': 'array' if accidentaly_homogeneous else 'tuple',
-            'pseudo_type': ['Array', element_type, len(elts)] if accidentaly_homogeneous else ['Tuple'] + element_type,
+            'pseudo_type': make_type('Array', element_type, len(elts)) if accidentaly_homogeneous else make_type('Tuple', *element_type),
             'elements': element_nodes
         }
 
+    def _packed_literal(self, kind, elements, keys=None):
+        '''
+        a packed_literal node for a list / set / dictionary of int, float or
+        string literals of one type, checked in one pass: the values are kept
+        in a list instead of a node for each of them
+
+        None if it has other elements: they go through the normal path
+        '''
+        value_type, values = self._literal_values(elements)
+        if value_type is None:
+            return None
+        elif keys is None:
+            return {'type': 'packed_literal', 'kind': kind, 'values': values, 'pseudo_type': make_type(kind.title(), value_type)}
+        key_type, keys = self._literal_values(keys)
+        if key_type is None:
+            return None
+        return {'type': 'packed_literal', 'kind': kind, 'keys': keys, 'values': values, 'pseudo_type': make_type('Dictionary', key_type, value_type)}
+
+    def _literal_values(self, nodes):
+        if all(isinstance(node, ast.Num) for node in nodes):
+            values = [node.n for node in nodes]
+            types = set(map(type, values))
+            if len(types) == 1 and types <= {int, float}:
+                return ('Int' if int in types else 'Float'), values
+        elif all(isinstance(node, ast.Str) for node in nodes):
+            return 'String', [node.s.replace('\n', '\\n') for node in nodes]
+        return None, None
+
     def _translate_elements(self, elements, kind, homogeneous=True):
         element_nodes = self._translate_node([elements[0]])
         #block [self._translate_node(elements[0])]
@@ -1394,13 +1761,11 @@ class ASTTranslator:
                 'index': z,
                 'pseudo_type': pseudo_type
             }
-            if result in self._tuple_assigned:
+            if self._tuple_assigned and node_key(result) in self._tuple_assigned:
                 j = z.get('value', z.get('name', z.get('attr', '_x')))
                 k = value_node.get('value', value_node.get('name', value_node.get('attr', '_y')))
                 # i kno c:
-                if not any(a[0] == '_old_%s_%s' % (j, k) for a in self._tuple_used):
-                    self._tuple_used.append(('_old_%s_%s' % (j, k), result))
-                result = {'type': 'local', 'name': '_old_%s_%s' % (j, k), 'pseudo_type': pseudo_type}
+                result = self._tuple_temporary('_old_%s_%s' % (j, k), result)
             return result
         else:
             return self._translate_slice(receiver=value_node, upper=slice.upper, step=slice.step, lower=slice.lower, location=location)
@@ -1417,7 +1782,7 @@ class ASTTranslator:
             'block': self._translate_node(body),
             #block [self._translate_node(node) for node in body],
             'handlers': self._translate_node(handlers)
-            #block [self._translate_handler(handler) for handler in handlers]
+            #block [self._translate_excepthandler(handler) for handler in handlers]
         }
 
     def _translate_raise(self, exc, cause, location):
@@ -1466,20 +1831,21 @@ class ASTTranslator:
         raise PseudoPythonTypeCheckError('the supported format for with requires exactly one line in body which is [<name> =] <handler>.read/write(..)')
 
 
-    def _translate_handler(self, handler):
-        if not isinstance(handler.type, ast.Name) or handler.type.id not in self._exceptions:
-            raise PseudoPythonTypeCheckError('%s' % str(ast.dump(handler.type)))
-        h = self.type_env[handler.name]
+    def _translate_excepthandler(self, type, name, body, location):
+        if not isinstance(type, ast.Name) or type.id not in self._exceptions or name is None:
+            raise translation_error('only except <exception> as <name> supported', location, self.lines[location[0]],
+                right='except ValueError as e:', wrong='except (ValueError, KeyError):')
+        h = self.type_env[name]
         if h and h != 'Exception':
-            raise PseudoPythonTypeCheckError("can't change the type of exception %s to %s" % (handler.name, serialize_type(h)))
-        self.type_env[handler.name] = 'Exception'
+            raise type_check_error("can't change the type of exception %s to %s" % (name, serialize_type(h)), location, self.lines[location[0]])
+        self.type_env[name] = 'Exception'
         return {
             'type': 'exception_handler',
             'pseudo_type': 'Void',
-            'exception': handler.type.id,
-            'is_builtin': handler.type.id == 'Exception',
-            'instance': handler.name,
-            'block': self._translate_node(handler.body)
+            'exception': type.id,
+            'is_builtin': type.id == 'Exception',
+            'instance': name,
+            'block': self._translate_node(body)
             #block [self._translate_node(z) for z in handler.body]
         }
 
@@ -1506,7 +1872,7 @@ class ASTTranslator:
             'type': 'anonymous_function',
             'params': params,
             'block': nodes,
-            'pseudo_type': ['Function', arg_type, node['pseudo_type']],
+            'pseudo_type': make_type('Function', arg_type, node['pseudo_type']),
             'return_type': node['pseudo_type']
         }
 
@@ -1535,8 +1901,8 @@ class ASTTranslator:
                     'args': [{
                         'type': 'anonymous_function',
                         'params': [sketchup['iterators']['iterator']],
-                        'pseudo_type': ['Function', sketchup['iterators']['iterator']['pseudo_type'],
-                                        elt['pseudo_type']],
+                        'pseudo_type': make_type('Function', sketchup['iterators']['iterator']['pseudo_type'],
+                                        elt['pseudo_type']),
                         'return_type': elt['pseudo_type'],
                         'block': [{
                             'type': 'implicit_return',
@@ -1544,7 +1910,7 @@ class ASTTranslator:
                             'pseudo_type': elt['pseudo_type']
                         }]
                     }],
-                    'pseudo_type': ['List', elt['pseudo_type']]
+                    'pseudo_type': make_type('List', elt['pseudo_type'])
                 }
 
             else:
@@ -1558,7 +1924,7 @@ class ASTTranslator:
 
         self.function_name = old_function_name
         sketchup['block'] = [elt_node]
-        sketchup['pseudo_type'] = ['List', elt_node['pseudo_type']]
+        sketchup['pseudo_type'] = make_type('List', elt_node['pseudo_type'])
         return sketchup
 
     def _translate_generatorexp(self, generators, elt, x, location):
@@ -1588,7 +1954,7 @@ class ASTTranslator:
                     'type': 'anonymous_function',
                     'params': [{'type': 'local', 'name': generators[0].target.id, 'pseudo_type': elt_type}],
                     'block': [Node('implicit_return', value=self._testable(block), pseudo_type='Boolean')],
-                    'pseudo_type': ['Function', elt_type, 'Boolean'],
+                    'pseudo_type': make_type('Function', elt_type, 'Boolean'),
                     'return_type': 'Boolean'
                 }],
                 'pseudo_type': 'Boolean'
@@ -1619,7 +1985,7 @@ class ASTTranslator:
                         'pseudo_type': block['pseudo_type']
                     }],
                     'return_type': block['pseudo_type'],
-                    'pseudo_type': ['Function', block['pseudo_type'], elt_type, block['pseudo_type']],
+                    'pseudo_type': make_type('Function', block['pseudo_type'], elt_type, block['pseudo_type']),
                 }, {
                     'type': block['pseudo_type'].lower(),
                     'value': initial,
@@ -1771,20 +2137,106 @@ class ASTTranslator:
             if actual != expected:
                 raise PseudoPythonNotTranslatableError("%s in %s is not a part of pseudo-translatable python" % (label if label[-1] != '_' else label[:-1], node))
 
-    def _translate_pure_functions(self):
-        for f in self.definitions:
-            if f[0] == 'function' and len(self.type_env['functions'][f[1]]) == 2:
-                self._definition_index['functions'][f[1]] = self._translate_function(self._definition_index['functions'][f[1]], 'functions', None, f[1], [])
+    def _infer_definitions(self):
+        '''
+        translate the functions with a known signature: hinted or without args
 
-    def _translate_hinted_functions(self):
-        for f in self.definitions:
-            if f[0] == 'function':
-                self._translate_hinted_fun(f[1], 'functions')
+        in the order of the strongly connected components of the call graph,
+        callees first, so their return types are known in their callers:
+        the other definitions are translated when their first call infers
+        their arg types, each of them once
+        '''
+        keys, known = [], []
+        for definition in self.definitions:
+            if definition[0] == 'function':
+                key = 'functions', definition[1]
+                keys.append(key)
+                self._hint_signature(definition[1], 'functions')
+                if len(self.type_env.top['functions'][definition[1]]) == 2 or self._hinted(key):
+                    known.append(key)
+            else:
+                keys.extend((definition[1], method) for method in definition[3])
+        nodes = self._definition_nodes(self.tree)
+        if len(known) > 1 or self.jobs != 1 and known: # else the order doesn't matter
+            graph = call_graph(keys, nodes, {name: base for name, (base, _) in self._hierarchy.items()})
+            order, known = {key: j for j, key in enumerate(keys)}, set(known)
+            known = [key for component in components(keys, graph) for key in sorted(component, key=order.get) if key in known]
+
+        pool = None
+        if self.jobs != 1:
+            from pseudo_python.parallel import IndependentTranslation
+            independent = [key for key in known if self._independent(key, graph[key])]
+            pool = IndependentTranslation.start(self, independent, self.jobs)
+        try:
+            for key in known:
+                namespace, name = key
+                if isinstance(self._definition_index[namespace][name], dict):
+                    continue
+                elif pool is not None and key in pool:
+                    self._definition_index[namespace][name], self._dependencies[key] = pool.get(key)
+                    self._definition_index[namespace][name]['pseudo_type'] = self.type_env.top[namespace][name]
+                    self._translated[namespace].add(name)
+                elif len(self.type_env.top[namespace][name]) == 2:
+                    self._definition_index[namespace][name] = self._translate_function(nodes[key], namespace, None, name, [])
+                else:
+                    self._definition_index[namespace][name] = self._translate_function(nodes[key], namespace, None, name, None)
+        finally:
+            if pool is not None:
+                pool.close()
+
+    def _hinted(self, key):
+        signature = self.type_env.top[key[0]][key[1]]
+        return len(signature) > 2 and signature[1] is not None
+
+    def _independent(self, key, callees):
+        '''
+        if translating key can't infer anything: it's hinted and calls only hinted
+        functions and no class appears in their signatures (its attrs may be unknown yet)
+        '''
+        for k in [key] + callees:
+            if k[0] != 'functions' or not self._hinted(k):
+                return False
+            types = list(self.type_env.top[k[0]][k[1]][1:])
+            for t in types:
+                if isinstance(t, list):
+                    types.extend(t[1:])
+                elif t in self._definition_index or t in self._exceptions:
+                    return False
+        return True
+
+    def _infer(self, node, z, receiver, name, args):
+        '''
+        _translate_function for a definition called while translating another one:
+        those nest as deep as the call chains, so past half of the recursion
+        limit the inference continues on a new thread stack (the caller waits)
+
+        a nested inference takes more than 10 frames: the stack is measured
+        only after limit // 64 of them
+        '''
+        limit = sys.getrecursionlimit()
+        self._inferring += 1
+        try:
+            if self._inferring < limit // 64 or stack_depth(limit) < limit // 2:
+                return self._translate_function(node, z, receiver, name, args)
+            inferring, self._inferring = self._inferring, 0
+            try:
+                return on_new_stack(self._translate_function, node, z, receiver, name, args)
+            finally:
+                self._inferring = inferring
+        finally:
+            self._inferring -= 1
 
     def _translate_hinted_fun(self, f, namespace):
         # print(namespace, self.type_env[namespace])
         if isinstance(self._definition_index[namespace][f], dict):
             return
+        if self._hint_signature(f, namespace):
+            self._definition_index[namespace][f] = self._translate_function(self._definition_index[namespace][f], namespace, None, f, None)
+
+    def _hint_signature(self, f, namespace):
+        '''
+        set the signature of a definition with annotated args, returns if it has them
+        '''
         if namespace == 'functions':
             args = self._definition_index[namespace][f].args.args
         else:
@@ -1803,8 +2255,9 @@ class ASTTranslator:
                 return_type = self._hint(return_annotation)
             else:
                 return_type = 'Void' # None
-            self.type_env[namespace][f][1:] = types + [return_type]
-            self._definition_index[namespace][f] = self._translate_function(self._definition_index[namespace][f], namespace, None, f, None)
+            self.type_env[namespace][f].set(types, return_type)
+            return True
+        return False
 
     def _hint(self, x):
         if isinstance(x, (ast.Name, ast.Str)):
@@ -1824,27 +2277,27 @@ class ASTTranslator:
                 if name in ['List', 'Set']:
                     if not isinstance(index, (ast.Name, ast.Subscript)):
                         raise type_check_error('%s expects one valid generic arguments' % name, (x.value.lineno, x.value.col_offset), self.lines[x.value.lineno])
-                    return [name, self._hint(index)]
+                    return make_type(name, self._hint(index))
                 elif name == 'Tuple':
                     if not isinstance(index, ast.Tuple) or any(not isinstance(y, (ast.Name, ast.Subscript)) for y in index.elts):
                         raise type_check_error('Tuple expected valid generic arguments', (x.value.lineno, x.value.col_offset), self.lines[x.value.lineno])
-                    return ['Tuple'] + [self._hint(y) for y in index.elts]
+                    return make_type('Tuple', *[self._hint(y) for y in index.elts])
                 elif name == 'Dict':
                     if not isinstance(index, ast.Tuple) or len(index.elts) != 2 or not isinstance(index.elts[1], (ast.Name, ast.Subscript)):
                         raise type_check_error('Dict expected 2 valid generic arguments', (x.value.lineno, x.value.col_offset), self.lines[x.value.lineno])
                     if not isinstance(index.elts[0], ast.Name) or index.elts[0].id not in KEY_TYPES:
                         raise type_check_error('type not supported as a dictionary key type', (x.value.lineno, x.value.col_offset), self.lines[x.value.lineno],
-                            suggestions='only those types are supported:\n  %s  ' % '\n  '.join(PSEUDO_KEY_TYPES),
+                            suggestions=lambda: 'only those types are supported:\n  %s  ' % '\n  '.join(PSEUDO_KEY_TYPES),
                             right='  Dict[str, List[int]]',
                             wrong='  Dict[List[int], Tuple[int]]')
-                    return ['Dictionary', self._hint(index.elts[0]), self._hint(index.elts[1])]
+                    return make_type('Dictionary', self._hint(index.elts[0]), self._hint(index.elts[1]))
                 else:
                     if not isinstance(index, ast.Tuple) or len(index.elts) != 2 or not isinstance(index.elts[0], ast.List) or not isinstance(index.elts[1], (ast.Name, ast.Subscript)) or any(not isinstance(y, (ast.Name, ast.Subscript)) for y in index.elts[0].elts):
                         raise type_check_error('Callable expected valid generic arguments of the form Callable[[<arg_type>, <arg_type>*], <return>]', (x.value.lineno, x.value.col_offset), self.lines[x.value.lineno])
-                    return ['Function'] + [self._hint(y) for y in index.elts[0].elts] + [self._hint(index.elts[1])]
+                    return make_type('Function', *[self._hint(y) for y in index.elts[0].elts] + [self._hint(index.elts[1])])
         raise type_check_error('type not recognized',
             (x.lineno, x.col_offset), self.lines[x.lineno],
-            suggestions='supported type hints are:\n  ' + '\n  '.join(
+            suggestions=lambda: 'supported type hints are:\n  ' + '\n  '.join(
                 ['int', 'float', 'str', 'bool',
                  'List[<element_hint>]', 'Dict[<key_hint>, <value_hint>]', 'Tuple[<element_hints>..]', 'Set[<element_hint>]', 'Callable[[<arg_hint>*], <return_hin>]'
                  'your class e.g. Human']))
@@ -1880,7 +2333,9 @@ class ASTTranslator:
         return g
 
     def _compatible_types(self, from_, to, err, silent=False):
-        if isinstance(from_, str):
+        if from_ is to: # interned types
+            return to
+        elif isinstance(from_, str):
             if not isinstance(to, str):
                 if silent:
                     return False
@@ -1932,4 +2387,45 @@ class ASTTranslator:
         else:
             return t
 
-
+def _dispatcher(name, fields, attribute):
+    '''
+    the function passing the fields of a node to the handler name,
+    in the order of its args (attrgetter reads them in C)
+    '''
+    get = operator.attrgetter(*fields) if fields else lambda node: ()
+    if attribute:
+        def dispatch(self, node, in_call):
+            line = getattr(node, 'lineno', None)
+            return getattr(self, name)(*get(node), location=(line, node.col_offset) if line else None, in_call=in_call)
+    elif len(fields) == 1:
+        def dispatch(self, node, in_call):
+            line = getattr(node, 'lineno', None)
+            return getattr(self, name)(get(node), location=(line, node.col_offset) if line else None)
+    else:
+        def dispatch(self, node, in_call):
+            line = getattr(node, 'lineno', None)
+            return getattr(self, name)(*get(node), location=(line, node.col_offset) if line else None)
+    return dispatch
+
+def _dispatch_table(cls):
+    '''
+    ast node type -> dispatch function for the node types with a _translate_<type> method
+    taking their fields (and location)
+    '''
+    table = {}
+    for node_type in vars(ast).values():
+        if not isinstance(node_type, type) or not issubclass(node_type, ast.AST):
+            continue
+        name = '_translate_%s' % node_type.__name__.lower()
+        handler = getattr(cls, name, None)
+        if handler is None:
+            continue
+        code = handler.__code__
+        args = code.co_varnames[1:code.co_argcount]
+        required = args[:len(args) - len(handler.__defaults__ or ())]
+        if not set(required) <= set(node_type._fields) | {'location'} or not set(node_type._fields) <= set(args):
+            continue # a helper named like a node type (_translate_in, _translate_slice)
+        table[node_type] = _dispatcher(name, [arg for arg in args if arg in node_type._fields], node_type is ast.Attribute)
+    return table
+
+ASTTranslator._dispatch = _dispatch_table(ASTTranslator)
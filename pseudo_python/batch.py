@@ -0,0 +1,192 @@
+import concurrent.futures
+import glob
+import os
+import sys
+import pseudo_python
+import pseudo_python.errors
+from pseudo_python.helpers import colored
+from pseudo_python.serialization import EXTENSIONS, FORMATS, dump
+
+USAGE = '''
+pseudo-python --batch [-j <jobs>] [-l <language>] [--format <format>] [--cache <cache.db>] <directory / glob>..
+
+translates every python file in the given directories (recursively)
+and glob patterns in a pool of <jobs> worker processes (default: cpu count)
+
+if you omit <language>, pseudo-python will generate a
+<filename.pseudo.yaml> file with serialized ast for each file
+(--format json / msgpack / container for .pseudo.json / .pseudo.msgpack / .pseudo.bin)
+
+with --cache, translated modules are stored in a sqlite database
+and unchanged sources aren't translated again
+
+examples:
+pseudo-python --batch src # generates a .pseudo.yaml for each file in src
+pseudo-python --batch -j 4 -l rb 'scripts/*.py' lib # ruby translations
+pseudo-python --batch --cache .pseudo-cache.db src
+pseudo-python --batch --format msgpack src
+'''
+
+_caches = {}
+
+def collect_files(patterns):
+    '''
+    expand directories (recursively) and glob patterns to a sorted list of .py files
+    '''
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                files.update(os.path.join(root, name) for name in names if name.endswith('.py'))
+        else:
+            files.update(filename for filename in glob.glob(pattern, recursive=True) if os.path.isfile(filename))
+    return sorted(files)
+
+def translate_file(filename, language=None, cache_path=None, format='yaml'):
+    '''
+    translate a single file, returns (output_filename, output, error)
+
+    runs in a worker process: the error is returned as text,
+    so a failing file doesn't stop the other ones
+    '''
+    base, _ = os.path.splitext(filename)
+    try:
+        if cache_path is not None and cache_path not in _caches:
+            from pseudo_python.cache import TranslationCache
+            _caches[cache_path] = TranslationCache(cache_path)
+        cache = _caches.get(cache_path)
+        with open(filename, 'r') as f:
+            source = f.read()
+        if language is None:
+            node = pseudo_python.translate(source, cache)
+            try:
+                return '%s.%s' % (base, EXTENSIONS[format]), dump(node, format), None
+            except (RecursionError, ValueError): # msgpack's ValueError: a too deep tree
+                return None, None, 'the pseudo ast is too deeply nested to serialize as %s: use --format container' % format
+        import pseudo
+        import pseudo.errors
+        output_filename = '%s.%s' % (base, pseudo.FILE_EXTENSIONS[language])
+        if output_filename == filename:
+            return None, None, 'this would overwrite the input file'
+        node = pseudo_python.translate(source, cache)
+        try:
+            return output_filename, pseudo.generate(node, language), None
+        except pseudo.errors.PseudoError as e:
+            return None, None, 'Pseudo error:\n%s' % e
+    except pseudo_python.errors.PseudoError as e:
+        return None, None, '\n'.join(str(part) for part in (e, e.suggestions, e.right, e.wrong) if part)
+    except SyntaxError as e:
+        return None, None, 'syntax error: %s' % e
+    except (OSError, IOError, ImportError) as e:
+        return None, None, str(e)
+    except Exception as e:
+        return None, None, 'internal error: %s: %s' % (type(e).__name__, e)
+
+def translate_batch(filenames, language=None, jobs=None, cache_path=None, format='yaml'):
+    '''
+    translate filenames in a process pool, largest files first
+
+    yields (filename, output_filename, error) in the order of filenames,
+    writing each output before yielding it
+    '''
+    def write(filename, result):
+        output_filename, output, error = result
+        if error is None:
+            with open(output_filename, 'wb' if isinstance(output, bytes) else 'w') as f:
+                f.write(output)
+        return filename, output_filename, error
+
+    if jobs == 1 or len(filenames) <= 1:
+        for filename in filenames:
+            yield write(filename, translate_file(filename, language, cache_path, format))
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for filename in sorted(filenames, key=os.path.getsize, reverse=True):
+            futures[filename] = executor.submit(translate_file, filename, language, cache_path, format)
+        for filename in filenames:
+            yield write(filename, futures[filename].result())
+
+def generate_language(node, language, output_filename=None):
+    '''
+    generate language code for a translated module
+
+    runs in a worker process: if output_filename is given,
+    the worker writes the output itself
+    '''
+    import pseudo
+    output = pseudo.generate(node, language)
+    if output_filename is not None:
+        with open(output_filename, 'w') as f:
+            f.write(output)
+    return output
+
+def generate_languages(node, languages, jobs=None, output_filenames=None):
+    '''
+    generate code for each of languages from the same translated module
+    in a process pool: the module is translated only once
+
+    yields (language, output, error) in the order of languages,
+    error is the exception raised by pseudo or None
+    '''
+    output_filenames = output_filenames or [None] * len(languages)
+    if jobs == 1 or len(languages) <= 1:
+        for language, output_filename in zip(languages, output_filenames):
+            try:
+                yield language, generate_language(node, language, output_filename), None
+            except Exception as e:
+                yield language, None, e
+        return
+
+    import pseudo # loaded once here instead of in each forked worker
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs or len(languages)) as executor:
+        futures = [executor.submit(generate_language, node, language, output_filename)
+                   for language, output_filename in zip(languages, output_filenames)]
+        for language, future in zip(languages, futures):
+            try:
+                yield language, future.result(), None
+            except Exception as e:
+                yield language, None, e
+
+def main(args):
+    jobs, language, cache_path, format, patterns = None, None, None, 'yaml', []
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in ('-j', '--jobs') and args:
+            jobs = int(args.pop(0))
+        elif arg in ('-l', '--language') and args:
+            language = args.pop(0)
+        elif arg == '--cache' and args:
+            cache_path = args.pop(0)
+        elif arg == '--format' and args:
+            format = args.pop(0)
+        else:
+            patterns.append(arg)
+
+    if not patterns:
+        print(USAGE)
+        return
+    if language is not None:
+        import pseudo
+    if language is not None and language not in pseudo.SUPPORTED_FORMATS:
+        print(colored('%s is not supported' % language, 'red'))
+        sys.exit(1)
+
+    if format not in FORMATS:
+        print(colored('%s is not a supported format: %s' % (format, ', '.join(FORMATS)), 'red'))
+        sys.exit(1)
+
+    filenames = collect_files(patterns)
+    failed = 0
+    for filename, output_filename, error in translate_batch(filenames, language, jobs, cache_path, format):
+        if error is None:
+            print(colored('OK   %s -> %s' % (filename, output_filename), 'green'))
+        else:
+            failed += 1
+            print(colored('FAIL %s\n%s' % (filename, error), 'red'))
+
+    print(colored('%d translated, %d failed' % (len(filenames) - failed, failed), 'red' if failed else 'green'))
+    if failed:
+        sys.exit(1)
@@ -9,47 +9,108 @@
 
 from pseudo_python.errors import PseudoPythonTypeCheckError
 from pseudo_python.helpers import serialize_type
+from pseudo_python.pseudo_types import make_type, intern_type
 
 V = '_' # we don't really typecheck or care for a lot of the arg types, so just use this
 _ = ()
 
-# we use lists instead of tuples, because it's easier this way
-# for different methods in the same type env to reference and update the same signature
+ARRAY_OF_STRINGS = make_type('Array', 'String')
+
+# signatures of user functions are pseudo_types.Signature objects:
+# methods in the same type env reference and update the same signature
 # that helps us with inherited methods: each one updates the type signature for the whole hierarchy
+# compound types are interned with make_type: compare them with ==, it's an identity check
+
+
+# (namespace, function) -> the checker compiled from its TYPED_API signature:
+# all of them at import, the ones added to TYPED_API later on their first check
+_checkers = {}
 
+# (namespace, function, receiver type, arg types) -> the checked signature
+# cleared when it has CHECKED_SIZE entries
+_checked = {}
+CHECKED_SIZE = 4096
+
+# bumped when an api is registered: what depends on the tables (the api fingerprint of the cache) compares it
+api_revision = 0
 
 def builtin_type_check(namespace, function, receiver, args):
-    fs = TYPED_API[namespace]
-    if fs == 'library':
-        fs = TYPED_API['_%s' % namespace]
-    # print(namespace, function, receiver, args, TYPED_API[namespace])
-    # input(0)
-    if function not in fs:
-        raise  PseudoPythonTypeCheckError('wrong usage of %s' % str(function))
-    x = fs[function]
-    
-    a = namespace + '#' + function if receiver else namespace + ':' + function
+    '''
+    [arg types.., return type] of a namespace function (or method, with a receiver)
+    for these args, raising PseudoPythonTypeCheckError if they don't fit
+
+    the result is shared by all the calls with the same types: don't change it
+    '''
+    receiver_type = receiver['pseudo_type'] if receiver else None
+    try:
+        key = namespace, function, receiver_type, tuple([arg['pseudo_type'] for arg in args])
+        checked = _checked.get(key)
+    except TypeError: # a Signature (or an uninterned list) isn't hashable
+        key, checked = None, None
+    if checked is not None:
+        return checked
+
+    checker = _checkers.get((namespace, function))
+    if checker is None:
+        fs = TYPED_API[namespace]
+        if fs == 'library':
+            fs = TYPED_API['_%s' % namespace]
+        if function not in fs:
+            raise  PseudoPythonTypeCheckError('wrong usage of %s' % str(function))
+        checker = _checkers[(namespace, function)] = compile_signature(namespace, function, fs[function])
+
+    checked = checker(receiver, args)
+    if key is not None:
+        if len(_checked) >= CHECKED_SIZE:
+            _checked.clear()
+        _checked[key] = checked
+    return checked
+
+def compile_signature(namespace, function, x):
+    '''
+    a checker(receiver, args) for the signature x of namespace function:
+    a signature without generics is simplified only once
+    '''
+    def label(receiver):
+        return namespace + '#' + function if receiver else namespace + ':' + function
+
     if namespace == 'List' or namespace == 'Set' or namespace == 'Array':
-        generics = {'@t': receiver['pseudo_type'][1]}
+        def generics_of(receiver):
+            return {'@t': receiver['pseudo_type'][1]}
     elif namespace == 'Dictionary':
-        generics = {'@k': receiver['pseudo_type'][1], '@v': receiver['pseudo_type'][2]}
+        def generics_of(receiver):
+            return {'@k': receiver['pseudo_type'][1], '@v': receiver['pseudo_type'][2]}
     else:
-        generics = {}
-    
-    s = []
-    if x[0][0] == '*':
-        e = x[0][1:]
-        for arg in args:
-            s.append(simplify(e, generics))
-            arg_check(s[-1], arg, a)
-    else:
-        if len(x) - 1 != len(args):   
-            raise PseudoPythonTypeCheckError("%s expects %d args not %d" % (a, len(x) - 1, args))
-        for e, arg in zip(x[:-1], args):
-            s.append(simplify(e, generics))
-            arg_check(s[-1], arg, a)
-    s.append(simplify(x[-1], generics))
-    return s
+        generics_of = None
+
+    variadic = x[0][0] == '*'
+    if variadic:
+        x = [x[0][1:], x[-1]]
+    generic = generics_of is not None and any(has_generics(t) for t in x)
+    params, return_type = x[:-1], x[-1]
+
+    def checker(receiver, args):
+        if generic:
+            generics = generics_of(receiver)
+            expected = [simplify(e, generics) for e in params]
+            result_type = simplify(return_type, generics)
+        else:
+            expected, result_type = params, return_type
+        if variadic:
+            expected = expected * len(args)
+        elif len(expected) != len(args):
+            raise PseudoPythonTypeCheckError("%s expects %d args not %d" % (label(receiver), len(expected), len(args)))
+        for e, arg in zip(expected, args):
+            if e != arg['pseudo_type']:
+                arg_check(e, arg, label(receiver))
+        return expected + [result_type]
+
+    return checker
+
+def has_generics(kind):
+    if isinstance(kind, str):
+        return kind[0] == '@'
+    return any(has_generics(child) for child in kind)
 
 def arg_check(expected_type, args, a):
     if expected_type != args['pseudo_type'] and expected_type != 'Any' and not(expected_type == 'Number' and (args['pseudo_type'] == 'Int' or args['pseudo_type'] == 'Float')):
@@ -64,7 +125,7 @@ def simplify(kind, generics):
         else:
             return kind
     else:
-        return [simplify(child, generics) for child in kind]
+        return make_type(*[simplify(child, generics) for child in kind])
 
 # refactoring here in future
 
@@ -119,10 +180,10 @@ def pow_(l, r):
 def mod(l, r):
     if l == 'Int' and r == 'Int':
         return [l, r, 'Int']
-    elif l == 'String' and (r == 'String' or r == ['Array', 'String']):
-        return [l, ['Array', 'String'], 'String']
+    elif l == 'String' and (r == 'String' or r == ARRAY_OF_STRINGS):
+        return [l, ARRAY_OF_STRINGS, 'String']
     else:
-        raise PseudoPythonTypeCheckError("wrong types for %: %s and %s" % (serialize_type(l), serialize_type(r)))
+        raise PseudoPythonTypeCheckError("wrong types for %%: %s and %s" % (serialize_type(l), serialize_type(r)))
 
 def and_(l, r):
     if l == 'Boolean' and r == 'Boolean':
@@ -281,6 +342,37 @@ TYPED_API = {
     # 'Dict#values':     [_, 'List<@v>'],
 }
 
+for namespace, api in TYPED_API.items():
+    if isinstance(api, dict):
+        for name, signature in api.items():
+            if isinstance(signature, list):
+                api[name] = [intern_type(t) for t in signature]
+                _checkers[(namespace, name)] = compile_signature(namespace, name, api[name])
+    else:
+        TYPED_API[namespace] = intern_type(api)
+
+def register_signature(namespace, function, signature, original=None):
+    '''
+    adds (or replaces) the signature [arg types.., return type] of namespace function
+    to TYPED_API: the pseudo side of a registered api
+
+    original is the python usage listed in the suggestions of errors
+    '''
+    signature = [intern_type(t) for t in signature]
+    TYPED_API.setdefault(namespace, {})[function] = signature
+    _checkers[(namespace, function)] = compile_signature(namespace, function, signature)
+    if original is not None:
+        ORIGINAL_METHODS.setdefault(namespace, {})[function] = original
+    api_changed()
+
+def api_changed():
+    '''
+    forgets the checks done with the old tables
+    '''
+    global api_revision
+    _checked.clear()
+    api_revision += 1
+
 # useful for error messages
 
 ORIGINAL_METHODS = {
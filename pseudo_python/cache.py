@@ -0,0 +1,149 @@
+import hashlib
+import pickle
+import sqlite3
+import time
+import types
+import pseudo_python
+import pseudo_python.builtin_typed_api
+from pseudo_python.api_translator import FUNCTION_API, METHOD_API
+from pseudo_python.builtin_typed_api import TYPED_API
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_api_fingerprint = None
+
+def describe(value):
+    '''
+    a stable textual description of an api table
+
+    functions are described by name and Standard objects by their fields,
+    so the result doesn't depend on object ids or dict order
+    '''
+    if isinstance(value, dict):
+        return '{%s}' % ', '.join(
+            '%s: %s' % (describe(k), describe(v))
+            for k, v
+            in sorted(value.items(), key=lambda item: repr(item[0])))
+    elif isinstance(value, (list, tuple)):
+        return '[%s]' % ', '.join(describe(v) for v in value)
+    elif isinstance(value, types.FunctionType):
+        return '%s.%s' % (value.__module__, value.__qualname__)
+    elif hasattr(value, '__dict__'):
+        return '%s(%s)' % (type(value).__name__, describe(vars(value)))
+    else:
+        return repr(value)
+
+def api_fingerprint():
+    '''
+    hash of the pseudo-python version and the TYPED_API, FUNCTION_API and METHOD_API tables,
+    computed again after an api is registered
+    '''
+    global _api_fingerprint
+    revision = pseudo_python.builtin_typed_api.api_revision
+    if _api_fingerprint is None or _api_fingerprint[0] != revision:
+        h = hashlib.sha256(pseudo_python.__version__.encode('utf-8'))
+        for table in (TYPED_API, FUNCTION_API, METHOD_API):
+            h.update(describe(table).encode('utf-8'))
+        _api_fingerprint = revision, h.hexdigest()
+    return _api_fingerprint[1]
+
+class TranslationCache:
+    '''
+    a content-addressed cache of translated modules
+
+    entries are keyed by the hash of the source and the api fingerprint
+    and stored in a sqlite database, so many worker processes can share it.
+    when the stored values exceed max_bytes, the least recently used ones are evicted
+    '''
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)')
+        self._connection.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    def key(self, source):
+        h = hashlib.sha256(api_fingerprint().encode('utf-8'))
+        h.update(source.encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, source):
+        key = self.key(source)
+        with self._transaction():
+            row = self._connection.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                self._connection.execute("UPDATE counters SET value = value + 1 WHERE name = 'misses'")
+                return None
+            self.hits += 1
+            self._connection.execute("UPDATE counters SET value = value + 1 WHERE name = 'hits'")
+            self._connection.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, source, module):
+        try:
+            value = pickle.dumps(module, pickle.HIGHEST_PROTOCOL)
+        except RecursionError: # a tree deeper than the recursion limit isn't cached
+            return
+        if len(value) > self.max_bytes:
+            return
+        with self._transaction():
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                (self.key(source), value, len(value), time.time()))
+            self._evict()
+
+    def _evict(self):
+        total = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._connection.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._connection.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    def stats(self):
+        '''
+        hits and misses of this instance, the totals of all processes and the size of the store
+        '''
+        counters = dict(self._connection.execute('SELECT name, value FROM counters'))
+        entries, size = self._connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'total_hits': counters['hits'],
+            'total_misses': counters['misses'],
+            'entries': entries,
+            'bytes': size
+        }
+
+    def clear(self):
+        with self._transaction():
+            self._connection.execute('DELETE FROM entries')
+            self._connection.execute('UPDATE counters SET value = 0')
+
+    def close(self):
+        self._connection.close()
+
+    def _transaction(self):
+        return _Transaction(self._connection)
+
+class _Transaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute('COMMIT' if exc_type is None else 'ROLLBACK')
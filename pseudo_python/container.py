@@ -0,0 +1,276 @@
+'''
+a compact binary container for translated modules
+
+layout:
+    MAGIC, toc offset, strings offset
+    the encoded module (without definitions, constants and main)
+    each definition, constant and main encoded separately
+    the table of contents: [section, name, offset] for each of them
+    the string table
+
+values are tagged: strings are indices in the string table, so repeated
+keys and type names ('pseudo_type', 'local', 'Int'..) are stored once,
+ints are zigzag varints
+
+Container(path) maps the file and decodes only the string table and the
+table of contents: container.definition(name) decodes just that definition
+'''
+
+import mmap
+import struct
+from pseudo_python.nodes import Node, to_dict
+
+MAGIC = b'PSEUDOC\x01'
+
+SECTIONS = ('definitions', 'constants', 'main')
+
+_HEADER = struct.Struct('<8sQQ')
+_FLOAT = struct.Struct('<d')
+
+_NONE, _TRUE, _FALSE, _INT, _FLOAT_TAG, _STRING, _LIST, _DICT = b'ntfidslm'
+
+_NO_KEY = object()
+
+class ContainerError(Exception):
+    pass
+
+def dump(module):
+    '''
+    encode a translated module as bytes
+    '''
+    if isinstance(module, Node):
+        module = to_dict(module)
+    writer = _Writer()
+    writer.out += _HEADER.pack(MAGIC, 0, 0)
+    rest = {key: None if key in SECTIONS else value for key, value in module.items()}
+    toc = [['module', '', writer.write(rest)]]
+    for section in SECTIONS:
+        if section == 'main':
+            if 'main' in module:
+                toc.append([section, '', writer.write(module['main'])])
+            continue
+        for node in module.get(section, []):
+            toc.append([section, _name(section, node), writer.write(node)])
+    toc_offset = writer.write(toc)
+
+    strings_offset = len(writer.out)
+    _write_varint(writer.out, len(writer.strings))
+    for string in writer.strings:
+        data = string.encode('utf-8')
+        _write_varint(writer.out, len(data))
+        writer.out += data
+    writer.out[:_HEADER.size] = _HEADER.pack(MAGIC, toc_offset, strings_offset)
+    return bytes(writer.out)
+
+def write(module, filename):
+    with open(filename, 'wb') as f:
+        f.write(dump(module))
+
+def load(data):
+    '''
+    decode a whole module from bytes
+    '''
+    return Container(data).module()
+
+class Container:
+    '''
+    a container in a buffer or a file (mapped with mmap)
+
+    only the string table and the table of contents are decoded
+    eagerly: definitions, constants and main are decoded when requested
+    '''
+
+    def __init__(self, source):
+        self._file = None
+        if isinstance(source, str):
+            self._file = open(source, 'rb')
+            source = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = source
+        if len(source) < _HEADER.size:
+            raise ContainerError('not a pseudo container: too short')
+        magic, toc_offset, strings_offset = _HEADER.unpack_from(source, 0)
+        if magic != MAGIC:
+            raise ContainerError('not a pseudo container: %r' % magic)
+
+        count, position = _read_varint(source, strings_offset)
+        self.strings = []
+        for _ in range(count):
+            size, position = _read_varint(source, position)
+            self.strings.append(bytes(source[position:position + size]).decode('utf-8'))
+            position += size
+
+        self.toc = self._read(toc_offset)
+        self._offsets = {}
+        for section, name, offset in self.toc:
+            self._offsets.setdefault((section, name), offset)
+
+    def names(self, section='definitions'):
+        return [name for s, name, _ in self.toc if s == section]
+
+    def definition(self, name):
+        return self._read(self._offset('definitions', name))
+
+    def constant(self, name):
+        return self._read(self._offset('constants', name))
+
+    def main(self):
+        return self._read(self._offset('main', ''))
+
+    def module(self):
+        module = self._read(self._offset('module', ''))
+        for section in SECTIONS:
+            if section in module:
+                module[section] = []
+        for section, _, offset in self.toc[1:]:
+            if section == 'main':
+                module['main'] = self._read(offset)
+            else:
+                module[section].append(self._read(offset))
+        return module
+
+    def close(self):
+        if self._file is not None:
+            self.buffer.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _offset(self, section, name):
+        if (section, name) not in self._offsets:
+            raise KeyError('%s %s not in container' % (section, name))
+        return self._offsets[(section, name)]
+
+    def _read(self, offset):
+        return _Reader(self.buffer, self.strings).value(offset)[0]
+
+def _name(section, node):
+    if isinstance(node, dict):
+        return str(node.get('name' if section == 'definitions' else 'constant', ''))
+    return ''
+
+class _Writer:
+    def __init__(self):
+        self.out = bytearray()
+        self.strings = {}
+
+    def write(self, value):
+        offset = len(self.out)
+        self.value(value)
+        return offset
+
+    def value(self, value):
+        # a stack of the values left to write: trees can be deeper than the recursion limit
+        out, stack = self.out, [value]
+        while stack:
+            value = stack.pop()
+            if value is None:
+                out.append(_NONE)
+            elif value is True:
+                out.append(_TRUE)
+            elif value is False:
+                out.append(_FALSE)
+            elif isinstance(value, str):
+                index = self.strings.get(value)
+                if index is None:
+                    index = self.strings[value] = len(self.strings)
+                out.append(_STRING)
+                _write_varint(out, index)
+            elif isinstance(value, int):
+                out.append(_INT)
+                _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+            elif isinstance(value, float):
+                out.append(_FLOAT_TAG)
+                out += _FLOAT.pack(value)
+            elif isinstance(value, (list, tuple)):
+                out.append(_LIST)
+                _write_varint(out, len(value))
+                stack.extend(reversed(value))
+            elif isinstance(value, dict):
+                out.append(_DICT)
+                _write_varint(out, len(value))
+                for key, element in reversed(list(value.items())):
+                    stack.append(element)
+                    stack.append(key)
+            else:
+                raise ContainerError("%s values can't be stored in a container" % type(value).__name__)
+
+class _Reader:
+    def __init__(self, buffer, strings):
+        self.buffer = buffer
+        self.strings = strings
+
+    def value(self, position):
+        '''
+        (the value at position, the position after it)
+
+        the lists and dicts being read are on a stack of [container, elements left,
+        key of the next dict value or _NO_KEY]: trees can be deeper than the recursion limit
+        '''
+        buffer, stack = self.buffer, []
+        while True:
+            tag = buffer[position]
+            position += 1
+            if tag == _STRING:
+                index, position = _read_varint(buffer, position)
+                value = self.strings[index]
+            elif tag == _DICT or tag == _LIST:
+                count, position = _read_varint(buffer, position)
+                value = {} if tag == _DICT else []
+                if count:
+                    stack.append([value, count, _NO_KEY])
+                    continue
+            elif tag == _INT:
+                value, position = _read_varint(buffer, position)
+                value = (value >> 1) if value & 1 == 0 else -((value + 1) >> 1)
+            elif tag == _NONE:
+                value = None
+            elif tag == _TRUE:
+                value = True
+            elif tag == _FALSE:
+                value = False
+            elif tag == _FLOAT_TAG:
+                value = _FLOAT.unpack_from(buffer, position)[0]
+                position += _FLOAT.size
+            else:
+                raise ContainerError('corrupted container: tag %r at %d' % (tag, position - 1))
+
+            # add the value to its container, then each finished container to its own
+            while stack:
+                frame = stack[-1]
+                container = frame[0]
+                if isinstance(container, dict):
+                    if frame[2] is _NO_KEY:
+                        frame[2] = value
+                        break
+                    container[frame[2]] = value
+                    frame[2] = _NO_KEY
+                else:
+                    container.append(value)
+                frame[1] -= 1
+                if frame[1]:
+                    break
+                stack.pop()
+                value = container
+            else:
+                return value, position
+
+def _write_varint(out, value):
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(buffer, position):
+    result, shift = 0, 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
@@ -1,18 +1,45 @@
 class Env:
+    '''
+    a scope: values and a parent scope
+
+    a lookup walks the parents once and caches the values of the env owning the name:
+    the cache entry is valid until the name is bound again in a new env,
+    which bumps its version (the versions are shared by all envs of a tree),
+    so a lookup is O(1) at any nesting depth
+
+    bind names with env[name] = value, not through env.values
+    '''
 
     def __init__(self, values=None, parent=None):
         self.values = values or {}
         self.parent = parent
         self.top = self if parent is None else parent.top
+        self._versions = {} if parent is None else parent._versions
+        self._owners = {}
 
     def __getitem__(self, key):
-        current = self
-        while current is not None:
-            if key in current.values:
-                return current.values[key]
+        values = self.values
+        if key in values:
+            return values[key]
+        parent = self.parent
+        if parent is None:
+            return None
+        elif key in parent.values: # most scopes are functions: children of top
+            return parent.values[key]
+        owner = self._owners.get(key)
+        if owner is not None and owner[1] == self._versions.get(key):
+            return owner[0].get(key)
+
+        current = parent.parent
+        while current is not None and key not in current.values:
             current = current.parent
+        owner_values = current.values if current is not None else {}
+        self._owners[key] = owner_values, self._versions.get(key)
+        return owner_values.get(key)
 
     def __setitem__(self, key, value):
+        if key not in self.values:
+            self._versions[key] = self._versions.get(key, 0) + 1
         self.values[key] = value
 
     # def motherify(self):
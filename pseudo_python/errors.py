@@ -1,12 +1,60 @@
 from pseudo_python.helpers import serialize_type
 
 class PseudoError(Exception):
-    def __init__(self, message, suggestions=None, right=None, wrong=None):
+    '''
+    a translation error with structured fields: location (line, column),
+    code (the line), wrong_type and the api namespace
+
+    the full message is formatted only by str(error) and suggestions, right
+    and wrong can be callables, called on first access: building the
+    suggestion tables is skipped when nobody shows them
+    '''
+
+    def __init__(self, message, suggestions=None, right=None, wrong=None,
+                 location=None, code=None, wrong_type=None, namespace=None):
         super(PseudoError, self).__init__(message)
 
-        self.suggestions = suggestions
-        self.right = right
-        self.wrong = wrong
+        self.message = message
+        self.location = location
+        self.code = code
+        self.wrong_type = wrong_type
+        self.namespace = namespace
+        self._suggestions = suggestions
+        self._right = right
+        self._wrong = wrong
+
+    def _resolve(self, name):
+        value = getattr(self, name)
+        if callable(value):
+            value = value()
+            setattr(self, name, value)
+        return value
+
+    @property
+    def suggestions(self):
+        return self._resolve('_suggestions')
+
+    @property
+    def right(self):
+        return self._resolve('_right')
+
+    @property
+    def wrong(self):
+        return self._resolve('_wrong')
+
+    def __str__(self):
+        if self.code is None:
+            return self.message
+        return '%s%s%s:\n%s\n%s^' % (
+            ('wrong type %s\n' % serialize_type(self.wrong_type) if self.wrong_type else ''),
+            self.message,
+            (' on line %d column %d' % self.location) if self.location else '',
+            self.code,
+            (tab_aware(self.location[1], self.code) if self.location else ''))
+
+    def __reduce__(self):
+        return type(self), (self.message, self.suggestions, self.right, self.wrong,
+                            self.location, self.code, self.wrong_type, self.namespace)
 
 class PseudoPythonNotTranslatableError(PseudoError):
     pass
@@ -25,13 +73,7 @@ def cant_infer_error(name, line):
 def beautiful_error(exception):
     def f(function):
         def decorated(data, location=None, code=None, wrong_type=None, **options):
-            return exception('%s%s%s:\n%s\n%s^' % (
-                ('wrong type %s\n' % serialize_type(wrong_type) if wrong_type else ''),
-                data,
-                (' on line %d column %d' % location) if location else '',
-                code or '',
-                (tab_aware(location[1], code) if location else '')),
-                **options)
+            return exception(data, location=location, code=code or '', wrong_type=wrong_type, **options)
         return decorated
     return f
 
@@ -36,3 +36,14 @@ def prepare_table(types, original_methods=None):
             max_return = len(returns[-1])
     return '\n'.join(
         '  %s %s -> %s' % (name.ljust(max_name), arg_types.ljust(max_arg), return_type.ljust(max_return)) for name, arg_types, return_type in zip(names, args, returns))
+
+def did_you_mean(names):
+    '''the first line of a suggestion for similar names, empty without them'''
+    if not names:
+        return ''
+    return 'did you mean %s?\n' % ' or '.join(names)
+
+def colored(text, color):
+    '''termcolor.colored, importing termcolor only when something is printed'''
+    import termcolor
+    return termcolor.colored(text, color)
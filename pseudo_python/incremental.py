@@ -0,0 +1,79 @@
+import ast
+import pseudo_python.parser
+from pseudo_python.ast_translator import ASTTranslator
+
+def definition_fingerprints(tree, source):
+    '''
+    (namespace, name) -> source of each function/method definition
+
+    everything else: imports, constants, main and the layout of classes
+    is collected together under 'main'. the source of a definition
+    doesn't include its position, so moving it doesn't change it
+    '''
+    lines = source.split('\n')
+    fingerprints, rest = {}, []
+    for n, text in _segments(tree.body, lines, len(lines)):
+        if isinstance(n, ast.FunctionDef):
+            fingerprints[('functions', n.name)] = text
+            rest.append('def %s' % n.name)
+        elif isinstance(n, ast.ClassDef):
+            layout = [lines[n.lineno - 1].strip()]
+            for m, method_text in _segments(n.body, lines, n.lineno + text.count('\n')):
+                if isinstance(m, ast.FunctionDef):
+                    fingerprints[(n.name, m.name)] = method_text
+                    layout.append('def %s' % m.name)
+                else:
+                    layout.append(ast.dump(m))
+            rest.append(' '.join(layout))
+        else:
+            rest.append(ast.dump(n))
+    fingerprints['main'] = '\n'.join(rest)
+    return fingerprints
+
+def _segments(nodes, lines, end):
+    '''
+    yields each node with its source: the lines until the next node
+    '''
+    starts = [min([n.lineno] + [d.lineno for d in getattr(n, 'decorator_list', [])]) for n in nodes]
+    for n, start, stop in zip(nodes, starts, starts[1:] + [end + 1]):
+        yield n, '\n'.join(line.rstrip() for line in lines[start - 1:stop - 1]).strip()
+
+class IncrementalTranslator:
+    '''
+    translates new versions of the same module, reusing the previous translation
+
+    only the definitions whose body changed and the definitions affected
+    by their inferred signatures are retranslated: other edits
+    fall back to a full translation
+
+    retranslated holds the (namespace, name) keys of the definitions
+    retranslated by the last translate, or None after a full translation
+    '''
+
+    def __init__(self):
+        self.module = None
+        self.retranslated = None
+        self._translator = None
+        self._fingerprints = {}
+
+    def translate(self, source):
+        tree = pseudo_python.parser.parse(source)
+        fingerprints = definition_fingerprints(tree, source)
+        if self._translator is not None and set(fingerprints) == set(self._fingerprints):
+            changed = {key for key, f in fingerprints.items() if f != self._fingerprints[key]}
+            if not changed:
+                self.retranslated = set()
+                return self.module
+            try:
+                module = self._translator.retranslate(tree, source, changed)
+            except Exception:
+                module = None
+            if module is not None:
+                self.module, self.retranslated, self._fingerprints = module, self._translator.retranslated, fingerprints
+                return module
+
+        self._translator = None
+        translator = ASTTranslator(tree, source)
+        self.module = translator.translate()
+        self._translator, self.retranslated, self._fingerprints = translator, None, fingerprints
+        return self.module
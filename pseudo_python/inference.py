@@ -0,0 +1,166 @@
+'''
+helpers of the type inference of ASTTranslator
+
+the call graph of the top level definitions, keyed like _definition_index:
+('functions', name) for a function, (class, method) for a method,
+its strongly connected components callees first,
+and new thread stacks for inferences nested deeper than the recursion limit
+'''
+
+import ast
+import sys
+import threading
+
+MAX_STACK_SIZE = 256 * 1024 * 1024
+
+_stack_size_lock = threading.Lock()
+
+def walk(node):
+    '''
+    the nodes under node, breadth first like ast.walk, but without
+    its generators (it's the most of the time of a call graph)
+    '''
+    nodes = [node]
+    for child in nodes:
+        for field in child._fields:
+            value = getattr(child, field, None)
+            if isinstance(value, list):
+                nodes.extend(element for element in value if isinstance(element, ast.AST))
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                nodes.append(value)
+    return nodes
+
+def callees(node, namespace, definitions, bases, classes, methods):
+    '''
+    the keys of the definitions a function node can call, each once
+
+    f(..) is ('functions', f), C(..) the methods of C (a constructor
+    translates its hinted and argless methods), self.m(..) m of the class or
+    of its closest base defining it and x.m(..) every method m
+    '''
+    result, seen = [], set()
+    for child in walk(node):
+        if not isinstance(child, ast.Call):
+            continue
+        func, keys = child.func, []
+        if isinstance(func, ast.Name):
+            if ('functions', func.id) in definitions:
+                keys = [('functions', func.id)]
+            else:
+                keys = classes.get(func.id, [])
+        elif isinstance(func, ast.Attribute):
+            if isinstance(func.value, ast.Name) and func.value.id == 'self' and namespace != 'functions':
+                owner = namespace
+                while owner is not None and (owner, func.attr) not in definitions:
+                    owner = bases.get(owner)
+                keys = [(owner, func.attr)] if owner is not None else []
+            else:
+                keys = methods.get(func.attr, [])
+        for key in keys:
+            if key not in seen:
+                seen.add(key)
+                result.append(key)
+    return result
+
+def call_graph(keys, definitions, bases):
+    '''
+    {key: [callee key]} for the keys (in source order) of definitions {key: function node}
+
+    bases is {class: base class or None}
+    '''
+    classes, methods = {}, {}
+    for key in keys:
+        if key[0] != 'functions':
+            classes.setdefault(key[0], []).append(key)
+            methods.setdefault(key[1], []).append(key)
+    return {key: callees(definitions[key], key[0], definitions, bases, classes, methods) for key in keys}
+
+def components(keys, graph):
+    '''
+    the strongly connected components of graph, callees first
+
+    tarjan's algorithm with an explicit stack (call chains can be longer
+    than the recursion limit), starting from the keys in order, so the
+    order is the same for the same source
+    '''
+    index, low, on_stack = {}, {}, set()
+    stack, result = [], []
+    for root in keys:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+        while work:
+            key, edges = work[-1]
+            for callee in edges:
+                if callee not in index:
+                    index[callee] = low[callee] = len(index)
+                    stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(graph.get(callee, ()))))
+                    break
+                elif callee in on_stack:
+                    low[key] = min(low[key], index[callee])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    low[caller] = min(low[caller], low[key])
+                if low[key] == index[key]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == key:
+                            break
+                    result.append(component)
+    return result
+
+def stack_depth(limit):
+    '''
+    the number of frames on the stack of the current thread, counting at most limit
+    '''
+    frame, depth = sys._getframe(1), 0
+    while frame is not None and depth < limit:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+def on_new_stack(function, *args):
+    '''
+    function(*args) on a new thread, waiting for it: the recursion limit
+    counts the frames of each thread, so it runs on an empty stack
+
+    the thread stack gets 8kB for each frame of the limit, at most MAX_STACK_SIZE.
+    the stack size is global: it's set and restored under _stack_size_lock
+    (so only around the threads started here). if the platform refuses
+    the size or the thread, function runs on the current stack
+    '''
+    outcome = []
+
+    def run():
+        try:
+            outcome.append((True, function(*args)))
+        except BaseException as e:
+            outcome.append((False, e))
+
+    thread = threading.Thread(target=run)
+    with _stack_size_lock:
+        try:
+            size = threading.stack_size()
+            threading.stack_size(min(max(size, sys.getrecursionlimit() * 8192), MAX_STACK_SIZE))
+            try:
+                thread.start()
+            finally:
+                threading.stack_size(size)
+        except (ValueError, RuntimeError):
+            thread = None
+    if thread is None:
+        return function(*args)
+    thread.join()
+    ok, value = outcome[0]
+    if not ok:
+        raise value
+    return value
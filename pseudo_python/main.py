@@ -5,16 +5,22 @@ import sys
 #sys.path.append("/home/alehander42/pseudo-python")
 import pseudo_python
 import pseudo_python.errors
-import pseudo
-import pseudo.errors
-from colorama import init
-from termcolor import colored
+import pseudo_python.serialization
+import pseudo_python.server
+from pseudo_python.helpers import colored
 
 USAGE = '''
-pseudo-python <input-filename.py> [<output-filename> / <language>]
+pseudo-python <input-filename.py> [<output-filename> / <language>]..
+pseudo-python [--format yaml / json / msgpack / container] <input-filename.py>
+pseudo-python [--profile] [--profile-json <profile.json>] <input-filename.py> [<output-filename> / <language>]..
+pseudo-python [-j <jobs>] <input-filename.py> [<output-filename> / <language>]..
+pseudo-python --batch [-j <jobs>] [-l <language>] [--format <format>] [--cache <cache.db>] <directory / glob>..
+pseudo-python --project [-j <jobs>] [--format <format>] <directory>
+pseudo-python --server [<socket>]
 
 where if you omit <language>, pseudo-python will generate a 
 <input-filename.pseudo.yaml> file with serialized ast 
+(or .pseudo.json / .pseudo.msgpack / .pseudo.bin with --format)
 
 if <output-filename> is provided, <language> will be extracted from 
 the extension
@@ -26,44 +32,132 @@ it can be:
   cs / csharp
   go
 
+with several languages / output filenames, the file is translated
+once and the code for each language is generated in parallel
+
+with -j, the hinted functions calling only hinted functions are translated
+in <jobs> worker processes (only for big annotated files: else it's slower)
+
+with --profile, a table of the calls, time and allocated bytes for each
+translator handler and each function/method is printed on stderr
+(--profile-json saves it as json)
+
+with --project, the files in the directory are translated as modules
+importing each other (see pseudo-python --project)
+
+with --server, pseudo-python starts a preloaded server on a unix socket
+($PSEUDO_PYTHON_SOCKET or pseudo-python-<uid>.sock in $TMPDIR or /tmp):
+while it's running, every pseudo-python command is executed by it
+
 examples:
 pseudo-python a.py # generates a.pseudo.yaml
+pseudo-python --format json a.py # generates a.pseudo.json
 pseudo-python z.py o.rb # generates a ruby translation in o.rb
+pseudo-python a.py rb js go cs # generates a.rb, a.js, a.go and a.cs
+pseudo-python --profile a.py # prints where the translation spends time
+pseudo-python --batch src # translates all files in src in parallel
+pseudo-python --project src # translates the modules of a project in src
 '''
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--server':
+        pseudo_python.server.serve(sys.argv[2] if len(sys.argv) > 2 else None, main)
+        return
+    code = pseudo_python.server.forward(sys.argv)
+    if code is not None:
+        sys.exit(code)
+
     if len(sys.argv) == 1:
         print(USAGE)
         return
+    elif sys.argv[1] in ('-b', '--batch'):
+        from pseudo_python.batch import main as batch_main
+        batch_main(sys.argv[2:])
+        return
+    elif sys.argv[1] == '--project':
+        from pseudo_python.project import main as project_main
+        project_main(sys.argv[2:])
+        return
+
+    format = 'yaml'
+    profile, profile_json, jobs = False, None, 1
+    while len(sys.argv) > 2 and sys.argv[1] in ('--format', '--profile', '--profile-json', '-j', '--jobs'):
+        if sys.argv[1] == '--profile':
+            profile = True
+            del sys.argv[1]
+        elif len(sys.argv) > 3:
+            if sys.argv[1] == '--format':
+                format = sys.argv[2]
+            elif sys.argv[1] in ('-j', '--jobs'):
+                jobs = int(sys.argv[2])
+            else:
+                profile_json = sys.argv[2]
+            del sys.argv[1:3]
+        else:
+            break
+    if format not in pseudo_python.serialization.FORMATS:
+        print(colored('%s is not a supported format: %s' % (format, ', '.join(pseudo_python.serialization.FORMATS)), 'red'))
+        exit(1)
 
     filename = sys.argv[1]
     with open(filename, 'r') as f:
         source = f.read()
     base, _ = os.path.splitext(filename)
     try:
-        if len(sys.argv) == 2:
-            clj = pseudo_python.translate_to_yaml(source)
-            with open('%s.pseudo.yaml' % base, 'w') as f:
-                f.write(clj)
-            print(colored('OK\nsaved pseudo ast as %s.pseudo.yaml' % base, 'green'))
+        if profile or profile_json:
+            node, report = pseudo_python.translate(source, profile=True)
+            if profile:
+                print(report.report(), file=sys.stderr)
+            if profile_json:
+                with open(profile_json, 'w') as f:
+                    f.write(report.to_json())
         else:
-            arg = sys.argv[2]
-            if '.' in arg:
-                base, language = os.path.splitext(arg)
-                language = language[1:]
-            else:
-                language = arg
-            if language not in pseudo.SUPPORTED_FORMATS:
-                print(colored('%s is not supported' % language, 'red'))
+            node = pseudo_python.translate(source, jobs=jobs)
+        if len(sys.argv) == 2:
+            output_filename = '%s.%s' % (base, pseudo_python.serialization.EXTENSIONS[format])
+            try:
+                output = pseudo_python.serialization.dump(node, format)
+            except ImportError as e:
+                print(colored(e, 'red'))
+                exit(1)
+            except (RuntimeError, ValueError): # RecursionError, msgpack's ValueError: a too deep tree
+                print(colored('the pseudo ast is too deeply nested to serialize as %s: use --format container' % format, 'red'))
                 exit(1)
-            if '%s.%s' % (base, pseudo.FILE_EXTENSIONS[language]) == filename:
-                print(colored('this would overwrite the input file, please choose another name', 'red'))                
+            with open(output_filename, 'wb' if format in pseudo_python.serialization.BINARY_FORMATS else 'w') as f:
+                f.write(output)
+            print(colored('OK\nsaved pseudo ast as %s' % output_filename, 'green'))
+        else:
+            import pseudo
+            import pseudo.errors
+            from pseudo_python.batch import generate_languages
+            languages, output_filenames = [], []
+            for arg in sys.argv[2:]:
+                if '.' in arg:
+                    output_base, language = os.path.splitext(arg)
+                    language = language[1:]
+                else:
+                    output_base, language = base, arg
+                if language not in pseudo.SUPPORTED_FORMATS:
+                    print(colored('%s is not supported' % language, 'red'))
+                    exit(1)
+                output_filename = '%s.%s' % (output_base, pseudo.FILE_EXTENSIONS[language])
+                if output_filename == filename:
+                    print(colored('this would overwrite the input file, please choose another name', 'red'))
+                    exit(1)
+                if output_filename not in output_filenames:
+                    languages.append(language)
+                    output_filenames.append(output_filename)
+            failed = False
+            for (language, _, error), output_filename in zip(generate_languages(node, languages, output_filenames=output_filenames), output_filenames):
+                if error is None:
+                    print(colored('OK\nsaved as %s' % output_filename, 'green'))
+                elif isinstance(error, pseudo.errors.PseudoError):
+                    print(colored('Pseudo error:\n%s' % error, 'red'))
+                    failed = True
+                else:
+                    raise error
+            if failed:
                 exit(1)
-            node = pseudo_python.translate(source)
-            output = pseudo.generate(node, language)
-            with open('%s.%s' % (base, pseudo.FILE_EXTENSIONS[language]), 'w') as f:
-                f.write(output)     
-            print(colored('OK\nsaved as %s.%s' % (base, pseudo.FILE_EXTENSIONS[language]), 'green'))
     except pseudo_python.errors.PseudoError as e:
         print(colored(e, 'red'))
         if e.suggestions:
@@ -73,9 +167,6 @@ def main():
         if e.wrong:
             print(colored('\nwrong:\n%s' % e.wrong, 'red'))
         exit(1)
-    except pseudo.errors.PseudoError as e:
-        print(colored('Pseudo error:\n%s' % e, 'red'))
-        exit(1)
 
 if __name__ == '__main__':
     main()
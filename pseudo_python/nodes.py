@@ -0,0 +1,198 @@
+'''
+slotted pseudo ast nodes
+
+a translated node is normally a dict: with ASTTranslator(tree, code, slotted=True)
+each {'type': .., ..} dict is converted to an instance of a __slots__ class
+(one for each node type and set of keys), which needs several times less
+memory than a small dict
+
+nodes support the dict api the translator and pseudo use (node['key'],
+node['key'] = value, get, in, keys/values/items, == with dicts):
+use to_dict(node) before passing a tree to pseudo.generate
+
+with ASTTranslator(tree, code, packed=True) lists, sets and dicts of int, float
+or string literals are packed_literal nodes: {'type': 'packed_literal',
+'kind': 'list' / 'set' / 'dictionary', 'values': [..] ('keys': [..]),
+'pseudo_type': ..}, a plain list of values instead of a node for each one,
+which the serializers store as they are: to_dict expands them for pseudo
+'''
+
+from operator import attrgetter
+
+_classes = {}
+
+class Node:
+    '''
+    base class of the slotted nodes
+
+    each key is stored in a numbered slot, keys set later
+    which are not in the class are kept in _extra
+    '''
+    __slots__ = ('_extra',)
+
+    _keys = ()
+    _getters = {}
+    _setters = {}
+
+    def __getitem__(self, key):
+        getter = self._getters.get(key)
+        if getter is not None:
+            return getter(self)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        setter = self._setters.get(key)
+        if setter is not None:
+            setter(self, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._getters or self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        getter = self._getters.get(key)
+        if getter is not None:
+            return getter(self)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def keys(self):
+        if self._extra is None:
+            return list(self._keys)
+        return list(self._keys) + list(self._extra)
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._keys) + (len(self._extra) if self._extra is not None else 0)
+
+    def __eq__(self, other):
+        if isinstance(other, (Node, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return _from_items, (self.items(),)
+
+def node_class(kind, keys):
+    '''
+    the slotted class for nodes of this type with these keys (in this order)
+    '''
+    cls = _classes.get((kind, keys))
+    if cls is None:
+        slots = tuple('_%d' % j for j in range(len(keys)))
+        name = '%sNode' % ''.join(word.title() for word in kind.split('_'))
+        cls = _classes[(kind, keys)] = type(name, (Node,), {'__slots__': slots})
+        cls._keys = keys
+        cls._getters = {key: attrgetter(slot) for key, slot in zip(keys, slots)}
+        cls._setters = {key: getattr(cls, slot).__set__ for key, slot in zip(keys, slots)}
+        cls._setter_list = [getattr(cls, slot).__set__ for slot in slots]
+    return cls
+
+def to_node(value):
+    '''
+    convert the dicts with a type in value to slotted nodes
+
+    lists and other dicts are converted in place, existing nodes are
+    not visited again and lists without dicts (types) are not changed
+    '''
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if isinstance(child, (dict, list)):
+                converted = to_node(child)
+                if converted is not child:
+                    value[key] = converted
+        if isinstance(value.get('type'), str):
+            cls = node_class(value['type'], tuple(value))
+            node = cls.__new__(cls)
+            node._extra = None
+            for setter, child in zip(cls._setter_list, value.values()):
+                setter(node, child)
+            return node
+    elif isinstance(value, list):
+        for j, child in enumerate(value):
+            if isinstance(child, (dict, list)):
+                converted = to_node(child)
+                if converted is not child:
+                    value[j] = converted
+    return value
+
+def to_dict(value):
+    '''
+    a copy of value with plain dicts instead of nodes, e.g. for pseudo or yaml
+
+    packed literals are expanded to list / set / dictionary nodes
+
+    iterative: each copy is filled from a stack of (copy, key, child),
+    so a tree deeper than the recursion limit (a long chain of binary ops) works
+    '''
+    root = [value]
+    stack = [(root, 0, value)]
+    while stack:
+        parent, key, value = stack.pop()
+        if isinstance(value, (Node, dict)):
+            if value.get('type') == 'packed_literal':
+                parent[key] = unpack_literal(value)
+                continue
+            copy = parent[key] = {}
+            for child_key, child in value.items():
+                copy[child_key] = child
+                if isinstance(child, (Node, dict, list)):
+                    stack.append((copy, child_key, child))
+        elif isinstance(value, list):
+            copy = parent[key] = list(value)
+            for j, child in enumerate(value):
+                if isinstance(child, (Node, dict, list)):
+                    stack.append((copy, j, child))
+    return root[0]
+
+def node_key(value):
+    '''
+    a hashable key for a node (dict or slotted): two nodes have the same key
+    iff they are equal
+    '''
+    if isinstance(value, (Node, dict)):
+        return ('{', tuple(sorted((key, node_key(child)) for key, child in value.items())))
+    elif isinstance(value, list): # types too: an interned type equals the same list
+        return ('[',) + tuple(node_key(child) for child in value)
+    elif isinstance(value, tuple):
+        return ('(',) + tuple(node_key(child) for child in value)
+    else:
+        return value
+
+LITERAL_NODES = {'Int': 'int', 'Float': 'float', 'String': 'string'}
+
+def unpack_literal(node):
+    '''
+    the list / set / dictionary node with a node for each value of a packed_literal
+    '''
+    pseudo_type = node['pseudo_type']
+    value_type = pseudo_type[-1]
+    values = [{'type': LITERAL_NODES[value_type], 'value': value, 'pseudo_type': value_type} for value in node['values']]
+    if node['kind'] != 'dictionary':
+        return {'type': node['kind'], 'pseudo_type': pseudo_type, 'elements': values}
+    key_type = pseudo_type[1]
+    return {'type': 'dictionary', 'pseudo_type': pseudo_type, 'pairs': [
+        {'type': 'pair', 'key': {'type': LITERAL_NODES[key_type], 'value': key, 'pseudo_type': key_type}, 'value': value}
+        for key, value in zip(node['keys'], values)]}
+
+def _from_items(items):
+    return to_node(dict(items))
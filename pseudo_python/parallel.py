@@ -0,0 +1,94 @@
+'''
+parallel translation of the independent definitions of a module
+
+a definition is independent if its signature is hinted and it only calls
+hinted functions, with no class in their types: translating it can't
+infer anything, so it gives the same node in any process
+
+the workers are forked after the top level pass, so each one starts from
+the same signature table (a copy on write snapshot: nothing is pickled but
+the translated definitions) and translates chunks of the independent ones
+'''
+
+import concurrent.futures
+import multiprocessing
+import sys
+
+# with fewer independent definitions the workers cost more than they save
+MINIMUM = 32
+
+# chunks for each worker: a few, so a slow chunk doesn't leave the others idle
+CHUNKS = 4
+
+_translator = None
+
+def _start_worker(translator):
+    global _translator
+    _translator = translator
+
+def _translate_chunk(keys):
+    '''
+    runs in a worker: [(node, dependencies, error)] for keys,
+    stopping after the first error
+    '''
+    results = []
+    for namespace, name in keys:
+        try:
+            node = _translator._translate_function(_translator._definition_index[namespace][name], namespace, None, name, None)
+        except Exception as e:
+            results.append((None, None, e))
+            break
+        results.append((node, _translator._dependencies.get((namespace, name), set()), None))
+    return results
+
+def fork_context():
+    '''
+    the fork multiprocessing context or None if the platform
+    (or a python before 3.7, without pool initializers) can't fork one
+    '''
+    if sys.version_info < (3, 7):
+        return None
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:
+        return None
+
+class IndependentTranslation:
+    '''
+    keys translated by a pool of jobs forked workers (None: cpu count)
+
+    get(key) waits for the (node, dependencies) of key, raising its error if
+    it failed, close() stops the workers: use start(), it's None if keys are
+    too few or the platform can't fork
+    '''
+
+    def __init__(self, translator, keys, jobs, context):
+        size = -(-len(keys) // (jobs * CHUNKS))
+        chunks = [keys[j:j + size] for j in range(0, len(keys), size)]
+        self._positions = {key: (j, k) for j, chunk in enumerate(chunks) for k, key in enumerate(chunk)}
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_start_worker, initargs=(translator,))
+        self._futures = [self._executor.submit(_translate_chunk, chunk) for chunk in chunks]
+
+    @classmethod
+    def start(cls, translator, keys, jobs):
+        context = fork_context()
+        jobs = jobs or multiprocessing.cpu_count()
+        if context is None or jobs <= 1 or len(keys) < MINIMUM:
+            return None
+        return cls(translator, keys, jobs, context)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def get(self, key):
+        j, k = self._positions[key]
+        results = self._futures[j].result()
+        node, dependencies, error = results[k]
+        if error is not None:
+            raise error
+        return node, dependencies
+
+    def close(self):
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown()
@@ -0,0 +1,129 @@
+'''
+per handler and per definition profile of an ASTTranslator
+
+Profile.run(translator) replaces the _translate_* methods of this translator
+instance (not of the class) with wrappers recording the calls, the
+cumulative and self time and the bytes allocated (tracemalloc) by each of them,
+so a translator without a profile runs the unchanged methods
+
+the definitions are the functions/methods (by _translate_function) and main
+'''
+
+import json
+import time
+import tracemalloc
+
+# calls, cumulative seconds, self seconds, cumulative bytes, self bytes
+CALLS, CUMULATIVE, SELF, BYTES, SELF_BYTES = range(5)
+
+FIELDS = ('calls', 'cumulative', 'self', 'bytes', 'self_bytes')
+
+class Profile:
+    '''
+    handlers: {handler name: [calls, cumulative, self, bytes, self_bytes]}
+    definitions: the same for 'main', 'f' or 'Class.method'
+
+    bytes are the net growth of the traced memory while the handler runs
+    '''
+
+    def __init__(self):
+        self.handlers = {}
+        self.definitions = {}
+        self.total = 0.0
+        self._stacks = {'handlers': [], 'definitions': []}
+        self._active = {'handlers': {}, 'definitions': {}}
+
+    def run(self, translator):
+        '''
+        translate with translator, recording the profile: returns the module
+        '''
+        for name in dir(type(translator)):
+            if name.startswith('_translate_') and name != '_translate_node':
+                setattr(translator, name, self._wrap('handlers', self._constant_key(name[11:]), getattr(translator, name)))
+        translator._translate_function = self._wrap('definitions', self._definition_key, translator._translate_function)
+        translator._translate_main = self._wrap('definitions', self._constant_key('main'), translator._translate_main)
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            return translator.translate()
+        finally:
+            self.total += time.perf_counter() - start
+            if not tracing:
+                tracemalloc.stop()
+
+    def _constant_key(self, key):
+        return lambda args: key
+
+    def _definition_key(self, args):
+        # node, namespace, receiver, name, args
+        namespace, name = args[1], args[3]
+        return name if namespace == 'functions' else '%s.%s' % (namespace, name)
+
+    def _wrap(self, table, key_of, function):
+        stats, stack, active = getattr(self, table), self._stacks[table], self._active[table]
+        memory, clock = tracemalloc.get_traced_memory, time.perf_counter
+
+        def profiled(*args, **kwargs):
+            key = key_of(args)
+            active[key] = active.get(key, 0) + 1
+            stack.append([0.0, 0])
+            allocated, start = memory()[0], clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed, allocated = clock() - start, memory()[0] - allocated
+                children_time, children_bytes = stack.pop()
+                active[key] -= 1
+                entry = stats.get(key)
+                if entry is None:
+                    entry = stats[key] = [0, 0.0, 0.0, 0, 0]
+                entry[CALLS] += 1
+                entry[SELF] += elapsed - children_time
+                entry[SELF_BYTES] += allocated - children_bytes
+                if not active[key]: # recursive calls are already in the outermost one
+                    entry[CUMULATIVE] += elapsed
+                    entry[BYTES] += allocated
+                if stack:
+                    stack[-1][0] += elapsed
+                    stack[-1][1] += allocated
+        return profiled
+
+    def as_dict(self, sort='self'):
+        '''
+        {'total': seconds, 'handlers': [{'name': .., 'calls': .., ..}], 'definitions': [..]}
+        with the entries sorted by the sort field, largest first
+        '''
+        return {
+            'total': self.total,
+            'handlers': self._entries(self.handlers, sort),
+            'definitions': self._entries(self.definitions, sort)
+        }
+
+    def _entries(self, stats, sort):
+        entries = [dict(zip(('name',) + FIELDS, [name] + entry)) for name, entry in stats.items()]
+        return sorted(entries, key=lambda entry: (-entry[sort], entry['name']))
+
+    def to_json(self, sort='self'):
+        return json.dumps(self.as_dict(sort), indent=2)
+
+    def report(self, sort='self', limit=None):
+        '''
+        a table for the handlers and the definitions, sorted by the sort field
+        '''
+        profile = self.as_dict(sort)
+        lines = ['total %.1fms' % (profile['total'] * 1000)]
+        for label in ('handlers', 'definitions'):
+            entries = profile[label][:limit]
+            width = max([len(label)] + [len(entry['name']) for entry in entries])
+            lines.append('')
+            lines.append('%s %8s %12s %12s %12s %12s' % (
+                label.ljust(width), 'calls', 'cumulative', 'self', 'bytes', 'self bytes'))
+            for entry in entries:
+                lines.append('%s %8d %10.2fms %10.2fms %11.1fK %11.1fK' % (
+                    entry['name'].ljust(width), entry['calls'],
+                    entry['cumulative'] * 1000, entry['self'] * 1000,
+                    entry['bytes'] / 1024, entry['self_bytes'] / 1024))
+        return '\n'.join(lines)
@@ -0,0 +1,302 @@
+'''
+translation of a project: python modules importing each other
+
+a module can import the other modules of the project with import <module>
+(then <module>.<name>) and from <module> import <name>.. (or from .<module>
+for a module of the same package), the modules of a package with
+import <package>.<module> and from <package> import <module>
+
+each module is translated once, after the modules it imports: it sees
+their interfaces (see ASTTranslator.interface), the inferred signatures
+of their functions and methods, instead of their code, so a definition
+used by other modules must be inferred in its own module (called there
+or hinted). modules whose imports are translated are translated in
+parallel, in a pool of worker processes
+
+the interface of a translated module can be saved in a summary file (json):
+a module imported by the translated ones isn't translated again while its
+summary is up to date, keyed by the hash of its source, of the api tables
+and of the interfaces of its own imports
+'''
+
+import ast
+import concurrent.futures
+import hashlib
+import json
+import os
+import sys
+import pseudo_python.ast_translator
+import pseudo_python.parser
+from pseudo_python.errors import PseudoError, PseudoPythonNotTranslatableError
+from pseudo_python.helpers import colored
+from pseudo_python.inference import components
+from pseudo_python.pseudo_types import intern_type
+from pseudo_python.serialization import EXTENSIONS, FORMATS, dump
+
+SUMMARY_EXTENSION = 'pseudo-interface.json'
+
+USAGE = '''
+pseudo-python --project [-j <jobs>] [--format <format>] <directory> [<module>..]
+
+translates the python files in directory (recursively) as the modules
+of a project, named by their path in it (a/b.py is a.b, a/__init__.py is a):
+they can import each other. the modules are translated after their imports,
+the independent ones in a pool of <jobs> worker processes (default: cpu count)
+
+generates a <filename.pseudo.yaml> (or .pseudo.json / .pseudo.msgpack /
+.pseudo.bin with --format) file with serialized ast for each module
+and a <filename.pseudo-interface.json> summary of its interface
+
+with modules, only those are translated: the modules they import
+are read from their summaries if they didn't change
+
+examples:
+pseudo-python --project src
+pseudo-python --project -j 4 --format json src
+pseudo-python --project src shapes.area # after an edit of shapes/area.py
+'''
+
+def project_files(root):
+    '''
+    {module name: filename} for the python files in root
+    '''
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.endswith('.py'):
+                filename = os.path.join(directory, name)
+                parts = os.path.relpath(filename, root)[:-3].split(os.sep)
+                if parts[-1] == '__init__':
+                    parts.pop()
+                if parts:
+                    files['.'.join(parts)] = filename
+    return files
+
+def imports(name, tree, modules):
+    '''
+    {module as written in the imports of tree: its name} for the modules
+    of the project (the names in modules) imported by the module name
+    '''
+    package = name if any(module.startswith(name + '.') for module in modules) else name.rpartition('.')[0]
+    result = {}
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for al in node.names:
+                if al.name in modules:
+                    result[al.name] = al.name
+        elif isinstance(node, ast.ImportFrom):
+            if node.level == 0:
+                module = node.module
+            else:
+                parts = package.split('.') if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                module = '.'.join(parts[:len(parts) - node.level + 1] + ([node.module] if node.module else []))
+            written = '.' * node.level + (node.module or '')
+            prefix = written if node.module is None else written + '.'
+            names = []
+            for al in node.names:
+                if '%s.%s' % (module, al.name) in modules: # from a import b of a package a
+                    result[prefix + al.name] = '%s.%s' % (module, al.name)
+                else:
+                    names.append(al.name)
+            if names and module in modules:
+                result[written] = module
+    return result
+
+def translation_order(graph):
+    '''
+    the modules of graph {module: [imported module]}, each after its imports
+    (in sorted order otherwise), raising PseudoPythonNotTranslatableError on a cycle
+    '''
+    order = []
+    for component in components(sorted(graph), graph):
+        if len(component) > 1 or component[0] in graph[component[0]]:
+            raise PseudoPythonNotTranslatableError('circular imports between %s: pseudo-python translates each module after its imports' % ', '.join(sorted(component)))
+        order.append(component[0])
+    return order
+
+def translate_module(name, source, interfaces):
+    '''
+    (module, interface) of the module name, importing modules with interfaces
+    {module as written in the imports: interface}
+
+    runs in a worker process
+    '''
+    translator = pseudo_python.ast_translator.ASTTranslator(pseudo_python.parser.parse(source), source, interfaces=interfaces)
+    return translator.translate(), translator.interface(name)
+
+def interface_digest(interface):
+    return hashlib.sha256(json.dumps(interface, sort_keys=True).encode('utf-8')).hexdigest()
+
+def summary_key(source, imported):
+    '''
+    the key of the summary of a module: the hash of its source, the api tables
+    and the digests of the interfaces of the modules it imports [(name, digest)]
+    '''
+    from pseudo_python.cache import api_fingerprint
+    h = hashlib.sha256(api_fingerprint().encode('utf-8'))
+    h.update(source.encode('utf-8'))
+    for name, digest in sorted(imported):
+        h.update(('\n%s %s' % (name, digest)).encode('utf-8'))
+    return h.hexdigest()
+
+def write_summary(filename, key, interface):
+    with open(filename, 'w') as f:
+        json.dump({'key': key, 'interface': interface}, f, sort_keys=True, separators=(',', ':'))
+
+def read_summary(filename, key):
+    '''
+    the interface saved in the summary filename or None if it's missing, broken or has another key
+    '''
+    try:
+        with open(filename, 'r') as f:
+            summary = json.load(f)
+    except (OSError, IOError, ValueError):
+        return None
+    if not isinstance(summary, dict) or summary.get('key') != key:
+        return None
+    try:
+        interface = summary['interface']
+        interface['functions'] = {name: [intern_type(t) for t in signature] for name, signature in interface['functions'].items()}
+        interface['constants'] = {name: intern_type(t) for name, t in interface['constants'].items()}
+        for c in interface['classes']:
+            c['methods'] = {label: [intern_type(t) for t in signature] for label, signature in c['methods'].items()}
+            for attr, _ in c['attrs'].values():
+                attr['pseudo_type'] = intern_type(attr['pseudo_type'])
+        if not {'module', 'exceptions'} <= set(interface) or not all({'name', 'module', 'base'} <= set(c) for c in interface['classes']):
+            return None
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return interface
+
+def translate_project(sources, jobs=1, targets=None, summaries=None):
+    '''
+    translate the modules of a project {module name: source}: returns {module name: pseudo ast module}
+    for the targets (default: all), the other modules are translated only if the targets import them
+
+    with summaries {module name: filename}, the interfaces of the translated modules are saved
+    there and an imported module with an up to date summary isn't translated
+
+    a failing module raises its error, with the module name in its module field
+    '''
+    graph, written = {}, {}
+    for name, source in sources.items():
+        try:
+            written[name] = imports(name, pseudo_python.parser.parse(source), sources)
+        except SyntaxError as e:
+            e.module = name
+            raise
+        graph[name] = sorted(set(written[name].values()))
+    order = translation_order(graph)
+    targets = set(sources if targets is None else targets)
+    needed = set(targets)
+    for name in reversed(order):
+        if name in needed:
+            needed.update(graph[name])
+    order = [name for name in order if name in needed]
+    summaries = summaries or {}
+    modules, interfaces, digests, keys = {}, {}, {}, {}
+
+    def summarized(name):
+        keys[name] = summary_key(sources[name], [(imported, digests[imported]) for imported in graph[name]])
+        interface = read_summary(summaries[name], keys[name]) if name not in targets and name in summaries else None
+        if interface is not None:
+            interfaces[name], digests[name] = interface, interface_digest(interface)
+        return interface is not None
+
+    def translated(name, result):
+        module, interfaces[name] = result
+        digests[name] = interface_digest(interfaces[name])
+        if name in targets:
+            modules[name] = module
+        if name in summaries:
+            write_summary(summaries[name], keys[name], interfaces[name])
+
+    def module_interfaces(name):
+        return {module: interfaces[imported] for module, imported in written[name].items()}
+
+    if jobs == 1 or len(order) <= 1:
+        for name in order:
+            if summarized(name):
+                continue
+            try:
+                translated(name, translate_module(name, sources[name], module_interfaces(name)))
+            except Exception as e:
+                e.module = name
+                raise
+        return modules
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures, waiting = {}, list(order)
+        while waiting or futures:
+            ready = True
+            while ready:
+                ready = [name for name in waiting if all(module in interfaces for module in graph[name])]
+                for name in ready:
+                    waiting.remove(name)
+                    if summarized(name):
+                        continue
+                    futures[executor.submit(translate_module, name, sources[name], module_interfaces(name))] = name
+                ready = [name for name in ready if name in interfaces] # summarized: their importers can be ready
+            if not futures:
+                continue
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                try:
+                    translated(name, future.result())
+                except Exception as e:
+                    for other in futures:
+                        other.cancel()
+                    e.module = name
+                    raise
+    return modules
+
+def main(args):
+    jobs, format, names = None, 'yaml', []
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg in ('-j', '--jobs') and args:
+            jobs = int(args.pop(0))
+        elif arg == '--format' and args:
+            format = args.pop(0)
+        else:
+            names.append(arg)
+
+    if not names:
+        print(USAGE)
+        return
+    if format not in FORMATS:
+        print(colored('%s is not a supported format: %s' % (format, ', '.join(FORMATS)), 'red'))
+        sys.exit(1)
+
+    files = project_files(names[0])
+    for name in names[1:]:
+        if name not in files:
+            print(colored('%s is not a module of %s' % (name, names[0]), 'red'))
+            sys.exit(1)
+    sources = {}
+    for name, filename in files.items():
+        with open(filename, 'r') as f:
+            sources[name] = f.read()
+    summaries = {name: '%s.%s' % (os.path.splitext(filename)[0], SUMMARY_EXTENSION) for name, filename in files.items()}
+    try:
+        modules = translate_project(sources, jobs, names[1:] or None, summaries)
+    except PseudoError as e:
+        where = '%s: ' % files[e.module] if getattr(e, 'module', None) else ''
+        print(colored('%s%s' % (where, e), 'red'))
+        if e.suggestions:
+            print(colored(e.suggestions, 'green'))
+        sys.exit(1)
+    except SyntaxError as e:
+        print(colored('%s: syntax error: %s' % (files[e.module], e), 'red'))
+        sys.exit(1)
+
+    for name in sorted(modules):
+        output_filename = '%s.%s' % (os.path.splitext(files[name])[0], EXTENSIONS[format])
+        output = dump(modules[name], format)
+        with open(output_filename, 'wb' if isinstance(output, bytes) else 'w') as f:
+            f.write(output)
+        print(colored('OK   %s -> %s' % (files[name], output_filename), 'green'))
@@ -0,0 +1,121 @@
+'''
+interned pseudo types
+
+simple types are strings ('Int', 'String', class names), compound types
+are lists (['List', 'Int'], ['Function', 'Int', 'Boolean']): make_type
+returns the same immutable Type for the same parts, so comparing two
+compound types is an identity check and they can be hashed in O(1)
+
+a Type is a list subclass: pseudo, the tests and yaml/json see the
+same list form as before
+
+function signatures are different: they are mutable and shared by all
+the methods overriding each other in a hierarchy, so they are Signature
+objects changed only with set_args, set_return_type and reset
+
+the intern table holds weak references: a type nothing uses anymore is
+dropped, so a long running process (the fork server, batch workers)
+doesn't keep every type it has seen. while a type is alive make_type
+returns it, so the identity checks stay valid
+'''
+
+import weakref
+
+# parts -> weak reference to the Type
+_types = {}
+
+class Type(list):
+    '''
+    an interned compound type: create it only with make_type / intern_type
+    '''
+
+    __slots__ = ('__weakref__',)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        elif isinstance(other, Type):
+            return False
+        elif isinstance(other, list):
+            return list.__eq__(self, other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = object.__hash__
+
+    def _immutable(self, *args):
+        raise TypeError("pseudo types are immutable: use make_type")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return make_type, tuple(self)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+class Signature(list):
+    '''
+    ['Function', arg types.., return type] of a function or method
+    '''
+
+    def set_args(self, args):
+        list.__setitem__(self, slice(1, len(self) - 1), [intern_type(arg) for arg in args])
+
+    def set_return_type(self, return_type):
+        list.__setitem__(self, -1, intern_type(return_type))
+
+    def set(self, args, return_type):
+        list.__setitem__(self, slice(1, len(self)), [intern_type(arg) for arg in args] + [intern_type(return_type)])
+
+    def reset(self, args=True):
+        '''
+        forget the inferred return type (and the arg types)
+        '''
+        if args:
+            list.__setitem__(self, slice(1, len(self)), [None] * (len(self) - 1))
+        else:
+            list.__setitem__(self, -1, None)
+
+    def _immutable(self, *args):
+        raise TypeError('update signatures with set_args / set_return_type / reset')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return Signature, (list(self),)
+
+def new_signature(arg_count):
+    '''
+    a signature with arg_count unknown args and an unknown return type
+    '''
+    return Signature(['Function'] + [None] * (arg_count + 1))
+
+def make_type(*parts):
+    '''
+    the interned compound type with these parts: make_type('List', 'Int')
+    '''
+    parts = tuple(intern_type(part) for part in parts)
+    key = tuple((Signature, id(part)) if isinstance(part, Signature) else part for part in parts)
+    ref = _types.get(key)
+    t = ref() if ref is not None else None
+    if t is None:
+        t = Type(parts)
+        _types[key] = weakref.ref(t, lambda ref, key=key: _types.get(key) is ref and _types.pop(key))
+    return t
+
+def intern_type(t):
+    '''
+    t with all its compound (list) types interned
+    '''
+    if isinstance(t, (Type, Signature)) or not isinstance(t, (list, tuple)):
+        return t
+    return make_type(*t)
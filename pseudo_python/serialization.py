@@ -0,0 +1,81 @@
+'''
+serialization of translated modules
+
+yaml uses the libyaml C emitter/parser when PyYAML is built with it,
+json and msgpack are much faster and produce the same data,
+container is the indexed binary format of pseudo_python.container
+'''
+
+FORMATS = ('yaml', 'json', 'msgpack', 'container')
+
+EXTENSIONS = {'yaml': 'pseudo.yaml', 'json': 'pseudo.json', 'msgpack': 'pseudo.msgpack', 'container': 'pseudo.bin'}
+
+BINARY_FORMATS = {'msgpack', 'container'}
+
+from pseudo_python.nodes import Node, to_dict
+from pseudo_python.pseudo_types import Type, Signature
+
+_yaml_dumpers = {}
+
+def dump(module, format='yaml', aliases=False):
+    '''
+    serialize a translated module: str for yaml and json, bytes for msgpack and container
+
+    with aliases=False, objects shared in the tree (e.g. types) are
+    repeated instead of emitted as yaml anchors/aliases
+    '''
+    if isinstance(module, Node):
+        module = to_dict(module)
+    if format == 'yaml':
+        import yaml
+        return yaml.dump(module, Dumper=_yaml_dumper(aliases))
+    elif format == 'json':
+        import json
+        return json.dumps(module, separators=(',', ':'))
+    elif format == 'msgpack':
+        return _msgpack().packb(module, use_bin_type=True)
+    elif format == 'container':
+        import pseudo_python.container
+        return pseudo_python.container.dump(module)
+    else:
+        raise ValueError('%s is not a supported format: %s' % (format, ', '.join(FORMATS)))
+
+def load(data, format='yaml'):
+    '''
+    load a serialized module
+    '''
+    if format == 'yaml':
+        import yaml
+        return yaml.load(data, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    elif format == 'json':
+        import json
+        return json.loads(data)
+    elif format == 'msgpack':
+        return _msgpack().unpackb(data, raw=False)
+    elif format == 'container':
+        import pseudo_python.container
+        return pseudo_python.container.load(data)
+    else:
+        raise ValueError('%s is not a supported format: %s' % (format, ', '.join(FORMATS)))
+
+def _yaml_dumper(aliases):
+    if aliases not in _yaml_dumpers:
+        import yaml
+
+        class PseudoDumper(getattr(yaml, 'CDumper', yaml.Dumper)):
+            if not aliases:
+                def ignore_aliases(self, data):
+                    return True
+
+        # interned types and signatures are dumped as plain lists
+        for list_type in (Type, Signature):
+            PseudoDumper.add_representer(list_type, yaml.representer.SafeRepresenter.represent_list)
+        _yaml_dumpers[aliases] = PseudoDumper
+    return _yaml_dumpers[aliases]
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError('msgpack output needs the msgpack package: pip install msgpack')
+    return msgpack
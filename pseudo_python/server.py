@@ -0,0 +1,187 @@
+'''
+a fork server for the pseudo-python cli
+
+pseudo-python --server [<socket>] starts a process with all the
+dependencies loaded, listening on a unix socket. every pseudo-python
+invocation finding the socket sends its argv and cwd to it: a forked child
+runs the command and streams its stdout/stderr and exit code back
+'''
+import os
+import stat
+import struct
+import sys
+
+ENV_SOCKET = 'PSEUDO_PYTHON_SOCKET'
+ENV_NO_SERVER = 'PSEUDO_PYTHON_NO_SERVER'
+
+REQUEST, STDOUT, STDERR, EXIT = b'r', b'1', b'2', b'x'
+
+_HEADER = struct.Struct('!cI')
+
+_in_server = False
+
+# json, socket and signal are imported only if a server is running:
+# forward runs on every cli invocation
+
+def socket_path():
+    return os.environ.get(ENV_SOCKET) or os.path.join(os.environ.get('TMPDIR') or '/tmp', 'pseudo-python-%d.sock' % os.getuid())
+
+def owned_socket(path):
+    '''
+    if path is a unix socket owned by the current user: another user could
+    create one at the default path, to receive the commands and fake their output
+    '''
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid()
+
+def supported():
+    import socket
+    return hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork')
+
+def forward(argv, path=None):
+    '''
+    run argv in a running server
+
+    returns the exit code, or None if there is no server
+    '''
+    if _in_server or os.environ.get(ENV_NO_SERVER) or not hasattr(os, 'fork'):
+        return None
+    path = path or socket_path()
+    if not owned_socket(path) or not supported():
+        return None
+    import json
+    import socket
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+
+    with connection:
+        request = {'argv': list(argv), 'cwd': os.getcwd(), 'tty': sys.stdout.isatty()}
+        _send(connection, REQUEST, json.dumps(request).encode('utf-8'))
+        reader = connection.makefile('rb')
+        while True:
+            kind, data = _receive(reader)
+            if kind == STDOUT:
+                _write(sys.stdout, data)
+            elif kind == STDERR:
+                _write(sys.stderr, data)
+            elif kind == EXIT:
+                return int(data)
+            else:
+                print('pseudo-python server closed the connection', file=sys.stderr)
+                return 1
+
+def serve(path, run):
+    '''
+    listen on path and fork a child calling run() for each request
+    '''
+    import signal
+    import socket
+    global _in_server
+    _in_server = True
+    _preload()
+    path = path or socket_path()
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177) # the socket is created 0600: no window for other users
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen(64)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    print('pseudo-python server listening on %s' % path)
+    sys.stdout.flush()
+    try:
+        while True:
+            connection, _ = server.accept()
+            if os.fork() == 0:
+                server.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                _handle(connection, run)
+            connection.close()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+def _preload():
+    import yaml
+    import pseudo
+    import termcolor
+    import pseudo_python
+    import pseudo_python.ast_translator
+    pseudo_python.translate('print(0)')
+
+def _handle(connection, run):
+    import json
+    import traceback
+    code = 0
+    try:
+        request = json.loads(_receive(connection.makefile('rb'))[1].decode('utf-8'))
+        os.chdir(request['cwd'])
+        sys.argv = request['argv']
+        sys.stdout = _Stream(connection, STDOUT, request['tty'])
+        sys.stderr = _Stream(connection, STDERR, request['tty'])
+        run()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    try:
+        _send(connection, EXIT, str(code).encode('utf-8'))
+        connection.close()
+    finally:
+        os._exit(0)
+
+class _Stream:
+    '''
+    a text stream sending everything written to the client
+    '''
+    def __init__(self, connection, kind, tty):
+        self.connection = connection
+        self.kind = kind
+        self.tty = tty
+
+    def write(self, text):
+        _send(self.connection, self.kind, text.encode('utf-8'))
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return self.tty
+
+def _send(connection, kind, data):
+    connection.sendall(_HEADER.pack(kind, len(data)) + data)
+
+def _receive(reader):
+    header = reader.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None, b''
+    kind, size = _HEADER.unpack(header)
+    return kind, reader.read(size)
+
+def _write(stream, data):
+    if hasattr(stream, 'buffer'):
+        stream.buffer.write(data)
+        stream.buffer.flush()
+    else:
+        stream.write(data.decode('utf-8'))
@@ -0,0 +1,42 @@
+import unittest
+from pseudo_python import translate
+from pseudo_python.api_translator import ApiIndex, StandardCall, StandardMethodCall, register_method
+from pseudo_python.builtin_typed_api import register_signature
+from pseudo_python.cache import api_fingerprint
+from pseudo_python.errors import PseudoPythonNotTranslatableError
+
+class TestApiIndex(unittest.TestCase):
+    def test_overloads(self):
+        module = translate('import math\nprint(math.log(2.0), math.log(8.0, 2.0))\na = [2]\na.insert(1)\na.insert(4, 0)\n')
+        self.assertEqual([arg['function'] for arg in module['main'][0]['args']], ['ln', 'log'])
+        self.assertEqual([call['message'] for call in module['main'][2:]], ['insert', 'insert_at'])
+
+    def test_did_you_mean(self):
+        for source, suggestion in [('import math\nprint(math.sine(2.0))\n', 'did you mean sin?'),
+                                   ("a = 'la'\nprint(a.uper())\n", 'did you mean upper?')]:
+            with self.assertRaises(PseudoPythonNotTranslatableError) as e:
+                translate(source)
+            self.assertEqual(e.exception.suggestions.split('\n')[0], suggestion)
+
+    def test_register(self):
+        index = ApiIndex({'math': {'sin': StandardCall('math', 'sin')}})
+        log, ln = StandardCall('math', 'log'), StandardCall('math', 'ln')
+        index.register('math', 'log', log, 2)
+        index.register('math', 'log', ln, 1)
+        self.assertEqual([index.resolve('math', 'log', arity) for arity in (1, 2, 3)], [ln, log, None])
+        self.assertIsNotNone(index.resolve('math', 'sin', 3))
+        index.register('math', 'log', ln)
+        self.assertEqual(index.table['math']['log'], ln)
+        self.assertIs(index.resolve('math', 'log', 2), ln)
+
+    def test_register_method(self):
+        fingerprint = api_fingerprint()
+        register_signature('String', 'swap_case', ['String'], 'swapcase')
+        register_method('String', 'swapcase', StandardMethodCall('String', 'swap_case'))
+        self.assertNotEqual(api_fingerprint(), fingerprint)
+        module = translate("print('La'.swapcase())\n")
+        self.assertEqual(module['main'][0]['args'][0]['message'], 'swap_case')
+        self.assertEqual(module['main'][0]['args'][0]['pseudo_type'], 'String')
+
+if __name__ == '__main__':
+    unittest.main()
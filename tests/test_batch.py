@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+import pseudo
+from pseudo_python import translate, translate_to_languages
+from pseudo_python.batch import collect_files, translate_batch, generate_languages
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.dir.name, 'sub'))
+        self.write('a.py', 'def f(a):\n    return a\n\nf(2)\n')
+        self.write('sub/b.py', 'print(2)\n')
+        self.write('sub/c.py', 'def f(:\n')
+        self.write('notes.txt', '')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, name, source):
+        with open(os.path.join(self.dir.name, name), 'w') as f:
+            f.write(source)
+
+    def test_collect_files(self):
+        files = collect_files([self.dir.name, os.path.join(self.dir.name, '*.py')])
+        self.assertEqual([os.path.relpath(f, self.dir.name) for f in files], ['a.py', 'sub/b.py', 'sub/c.py'])
+
+    def test_translate_batch(self):
+        files = collect_files([self.dir.name])
+        results = list(translate_batch(files, jobs=2))
+        self.assertEqual([r[0] for r in results], files)
+        self.assertEqual([r[2] is None for r in results], [True, True, False])
+        self.assertTrue(os.path.exists(os.path.join(self.dir.name, 'a.pseudo.yaml')))
+        self.assertFalse(os.path.exists(os.path.join(self.dir.name, 'sub', 'c.pseudo.yaml')))
+
+    def test_translate_to_languages(self):
+        source = 'def f(a):\n    return a\n\nf(2)\n'
+        outputs = translate_to_languages(source, ['rb', 'js', 'go'], jobs=2)
+        self.assertEqual(outputs, {language: pseudo.generate(translate(source), language) for language in ('rb', 'js', 'go')})
+
+    def test_generate_languages_writes_outputs(self):
+        node = translate('print(2)\n')
+        filenames = [os.path.join(self.dir.name, 'a.rb'), os.path.join(self.dir.name, 'a.cpp')]
+        results = list(generate_languages(node, ['rb', 'cpp'], jobs=2, output_filenames=filenames))
+        self.assertEqual([r[0] for r in results], ['rb', 'cpp'])
+        with open(filenames[0]) as f:
+            self.assertEqual(f.read(), results[0][1])
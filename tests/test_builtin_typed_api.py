@@ -0,0 +1,36 @@
+import unittest
+from pseudo_python.builtin_typed_api import builtin_type_check
+from pseudo_python.errors import PseudoPythonTypeCheckError
+from pseudo_python.pseudo_types import make_type, new_signature
+
+def node(pseudo_type):
+    return {'type': 'local', 'name': 'x', 'pseudo_type': pseudo_type}
+
+class TestBuiltinTypeCheck(unittest.TestCase):
+    def test_generics(self):
+        for element in ('Int', 'String', make_type('List', 'Float')):
+            receiver = node(make_type('List', element))
+            self.assertEqual(builtin_type_check('List', 'push', receiver, [node(element)]), [element, 'Void'])
+            self.assertEqual(builtin_type_check('List', 'pop', receiver, []), [element])
+
+    def test_memoized(self):
+        receiver = node('String')
+        first = builtin_type_check('String', 'center', receiver, [node('Int'), node('String')])
+        self.assertIs(builtin_type_check('String', 'center', receiver, [node('Int'), node('String')]), first)
+        self.assertEqual(builtin_type_check('io', 'display', None, [node('Int')] * 3), ['Any'] * 3 + ['Void'])
+
+    def test_unhashable_types(self):
+        signature = new_signature(1)
+        self.assertEqual(builtin_type_check('global', 'to_string', None, [node(signature)]), ['Any', 'String'])
+
+    def test_errors(self):
+        for _ in range(2): # not memoized
+            with self.assertRaises(PseudoPythonTypeCheckError) as e:
+                builtin_type_check('List', 'push', node(make_type('List', 'Int')), [node('String')])
+            self.assertEqual(str(e.exception), 'List#push expected Int not String')
+        with self.assertRaises(PseudoPythonTypeCheckError) as e:
+            builtin_type_check('math', 'log', None, [node('Int')])
+        self.assertEqual(str(e.exception), 'math:log expects 2 args not 1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from pseudo_python import translate
+from pseudo_python.cache import TranslationCache
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'cache.db')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_hit_and_miss(self):
+        cache = TranslationCache(self.path)
+        source = 'def f(a):\n    return a\n\nf(2)\n'
+        first = translate(source, cache)
+        second = translate(source, cache)
+        self.assertEqual(first, second)
+        self.assertEqual(first, translate(source))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+        cache.close()
+
+        other = TranslationCache(self.path)
+        translate(source, other)
+        self.assertEqual(other.stats()['total_hits'], 2)
+        other.close()
+
+    def test_lru_eviction(self):
+        cache = TranslationCache(self.path)
+        translate('print(0)', cache)
+        cache.max_bytes = cache.stats()['bytes'] * 2
+        translate('print(1)', cache)
+        translate('print(0)', cache)
+        translate('print(2)', cache)
+        self.assertIsNotNone(cache.get('print(0)'))
+        self.assertIsNone(cache.get('print(1)'))
+        self.assertEqual(cache.stats()['entries'], 2)
+        cache.close()
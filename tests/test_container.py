@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from pseudo_python import translate
+from pseudo_python.container import Container, ContainerError, dump, load, write
+
+SOURCE = '''
+A = 2
+B = [2.5]
+
+def f(a, b):
+    return [a, b * A]
+
+class X:
+    def __init__(self, a):
+        self.a = a
+
+c = f(2, 4)
+print(c, X(2).a, B, -3)
+'''
+
+class TestContainer(unittest.TestCase):
+    def setUp(self):
+        self.module = translate(SOURCE)
+
+    def test_roundtrip(self):
+        self.assertEqual(load(dump(self.module)), self.module)
+
+    def test_partial_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'a.pseudo.bin')
+            write(self.module, filename)
+            with Container(filename) as container:
+                self.assertEqual(container.names(), ['f', 'X'])
+                self.assertEqual(container.names('constants'), ['A', 'B'])
+                self.assertEqual(container.definition('X'), self.module['definitions'][1])
+                self.assertEqual(container.constant('B'), self.module['constants'][1])
+                self.assertEqual(container.main(), self.module['main'])
+                with self.assertRaises(KeyError):
+                    container.definition('g')
+
+    def test_strings_are_interned(self):
+        data = dump(self.module)
+        self.assertEqual(data.count(b'pseudo_type'), 1)
+        self.assertEqual(data.count(b'Int'), 1)
+
+    def test_not_a_container(self):
+        with self.assertRaises(ContainerError):
+            Container(b'pseudo_type: Int\n' * 4)
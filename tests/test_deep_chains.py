@@ -0,0 +1,95 @@
+import os
+import tempfile
+import time
+import unittest
+from pseudo_python import translate
+from pseudo_python.batch import translate_batch
+from pseudo_python.cache import TranslationCache
+from pseudo_python.nodes import Node, to_dict
+from pseudo_python.serialization import dump, load
+
+def long_sum(terms):
+    return 'x = 1\ny = %s\nprint(y)\n' % ' + '.join(['x'] * terms)
+
+def elif_chain(branches):
+    return 'x = 1\nif x == 0:\n    y = 0\n%selse:\n    y = 1\nprint(y)\n' % ''.join(
+        'elif x == %d:\n    y = %d\n' % (j, j) for j in range(1, branches))
+
+def sum_depth(module):
+    node, depth = module['main'][1]['value'], 0
+    while node['type'] == 'binary_op':
+        node, depth = node['left'], depth + 1
+    return depth
+
+def translation_time(source, repeat=1):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        module = translate(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, module
+
+class TestDeepChains(unittest.TestCase):
+    def test_100k_term_expression(self):
+        small, _ = translation_time(long_sum(10000), 3)
+        large, module = translation_time(long_sum(100000), 2)
+        self.assertLess(large / 100000, small / 10000 * 2)
+
+        node, depth = module['main'][1]['value'], 0
+        while node['type'] == 'binary_op':
+            node, depth = node['left'], depth + 1
+        self.assertEqual(depth, 99999)
+
+    def test_dump_100k_term_expression(self):
+        # the output paths don't recurse either (== would: the depths are compared)
+        module = to_dict(translate(long_sum(100000), slotted=True))
+        self.assertIsInstance(module['main'][1]['value'], dict)
+        self.assertEqual(sum_depth(module), 99999)
+        self.assertEqual(sum_depth(load(dump(module, 'container'), 'container')), 99999)
+
+    def test_cached_deep_chain(self):
+        # pickle recurses: the module isn't cached, but it's translated
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TranslationCache(os.path.join(directory, 'cache.db'))
+            source = long_sum(5000)
+            self.assertEqual(sum_depth(translate(source, cache)), 4999)
+            self.assertEqual(sum_depth(translate(source, cache)), 4999)
+            self.assertEqual(cache.stats()['entries'], 0)
+            cache.close()
+
+    def test_batch_deep_chain(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = [os.path.join(directory, name) for name in ('a.py', 'b.py')]
+            for filename in filenames:
+                with open(filename, 'w') as f:
+                    f.write(long_sum(5000))
+            for jobs in (1, 2):
+                for filename, _, error in translate_batch(filenames, jobs=jobs):
+                    self.assertEqual(error, 'the pseudo ast is too deeply nested to serialize as yaml: use --format container')
+                results = list(translate_batch(filenames, jobs=jobs, format='container', cache_path=os.path.join(directory, 'cache.db')))
+                self.assertEqual([error for _, _, error in results], [None, None])
+            with open(os.path.join(directory, 'a.pseudo.bin'), 'rb') as f:
+                self.assertEqual(sum_depth(load(f.read(), 'container')), 4999)
+
+    def test_10k_branch_elif_chain(self):
+        small, _ = translation_time(elif_chain(1000), 3)
+        large, module = translation_time(elif_chain(10000), 2)
+        self.assertLess(large / 10000, small / 1000 * 2)
+
+        node, branches = module['main'][1], 0
+        self.assertEqual(node['type'], 'if_statement')
+        while node['type'] != 'else_statement':
+            node, branches = node['otherwise'], branches + 1
+        self.assertEqual(branches, 10000)
+
+    def test_slotted(self):
+        module = translate(long_sum(20000), slotted=True)
+        node, depth = module['main'][1]['value'], 0
+        while node['type'] == 'binary_op':
+            self.assertIsInstance(node, Node)
+            node, depth = node['left'], depth + 1
+        self.assertEqual(depth, 19999)
+
+if __name__ == '__main__':
+    unittest.main()
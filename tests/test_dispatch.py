@@ -0,0 +1,22 @@
+import ast
+import unittest
+from pseudo_python import translate
+from pseudo_python.ast_translator import ASTTranslator
+from pseudo_python.errors import PseudoPythonNotTranslatableError
+
+class TestDispatch(unittest.TestCase):
+    def test_table(self):
+        # built with the class, for the node types with a handler taking their fields
+        self.assertIn(ast.Subscript, ASTTranslator._dispatch)
+        self.assertIn(ast.List, ASTTranslator._dispatch)
+        self.assertNotIn(ast.Slice, ASTTranslator._dispatch)
+        self.assertNotIn(ast.GeneratorExp, ASTTranslator._dispatch)
+        with self.assertRaises(PseudoPythonNotTranslatableError) as e:
+            translate('for i in range(2):\n    pass\n')
+        self.assertEqual(e.exception.message, 'Pass is not supported')
+
+    def test_constants_only_literals(self):
+        translate('K = [2, 4]\nprint(K)\n')
+        for source in ('K = [2, x]\nprint(K)\n', 'K = -2\nprint(K)\n'):
+            with self.assertRaises(PseudoPythonNotTranslatableError):
+                translate(source)
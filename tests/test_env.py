@@ -0,0 +1,32 @@
+import unittest
+from pseudo_python.env import Env
+
+class TestEnv(unittest.TestCase):
+    def test_shadowing_after_cached_lookup(self):
+        top = Env({'a': 'Int'})
+        env = top
+        for j in range(50):
+            env = env.child_env({'x%d' % j: j})
+        self.assertEqual(env['a'], 'Int')
+        self.assertEqual(env['x10'], 10)
+        self.assertIsNone(env['b'])
+
+        env.top['a'] = 'Float' # rebinding in the owner
+        self.assertEqual(env['a'], 'Float')
+        middle = env
+        for _ in range(20):
+            middle = middle.parent
+        middle['a'] = 'String' # shadowing
+        middle['b'] = 'Boolean'
+        self.assertEqual(env['a'], 'String')
+        self.assertEqual(env['b'], 'Boolean')
+        self.assertEqual(middle.parent['a'], 'Float')
+        self.assertIs(env.top, top)
+
+    def test_sibling_scopes(self):
+        top = Env({'a': 'Int'})
+        first, second = top.child_env().child_env(), top.child_env().child_env()
+        self.assertEqual(first['a'], 'Int')
+        second.parent['a'] = 'Float'
+        self.assertEqual(first['a'], 'Int')
+        self.assertEqual(second['a'], 'Float')
@@ -0,0 +1,46 @@
+import os
+import pickle
+import unittest
+import unittest.mock
+from pseudo_python import translate, is_translatable
+from pseudo_python.errors import PseudoError, PseudoPythonNotTranslatableError, translation_error
+
+class TestErrors(unittest.TestCase):
+    def test_structured_fields(self):
+        with self.assertRaises(PseudoPythonNotTranslatableError) as context:
+            translate('import math\nprint(math.lala(2))\n')
+        error = context.exception
+        self.assertEqual(error.location, (2, 6))
+        self.assertEqual(error.code, 'print(math.lala(2))')
+        self.assertEqual(error.namespace, 'math')
+        self.assertIn('on line 2 column 6', str(error))
+        self.assertIn('pseudo-python supports those math functions', error.suggestions)
+
+    def test_lazy_suggestions(self):
+        calls = []
+        error = translation_error('lala', (1, 2), 'a lala', suggestions=lambda: calls.append(0) or 'use lili')
+        self.assertEqual(str(error), 'lala on line 1 column 2:\na lala\n  ^')
+        self.assertEqual(calls, [])
+        self.assertEqual(error.suggestions, 'use lili')
+        self.assertEqual(error.suggestions, 'use lili')
+        self.assertEqual(calls, [0])
+
+        copy = pickle.loads(pickle.dumps(error))
+        self.assertEqual((str(copy), copy.suggestions, copy.location), (str(error), 'use lili', (1, 2)))
+        self.assertEqual(str(PseudoError('plain')), 'plain')
+
+    def test_is_translatable(self):
+        self.assertTrue(is_translatable('a = 2\nprint(a)\n'))
+        self.assertFalse(is_translatable('a = [2]\na.lala(2)\n'))
+        self.assertFalse(is_translatable('a = \n'))
+        with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples', 'error_handling.py')) as f:
+            self.assertTrue(is_translatable(f.read()))
+        self.assertFalse(is_translatable('try:\n    a = 2\nexcept:\n    a = 3\n'))
+        self.assertFalse(is_translatable("print('x %s' % ['a', 'b'])\n"))
+        # an internal error of the translator is raised
+        with unittest.mock.patch('pseudo_python.ast_translator.ASTTranslator._translate_top_level', side_effect=AttributeError('bug')):
+            with self.assertRaises(AttributeError):
+                is_translatable('a = 2\n')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+with open(os.path.join(ROOT, 'tests', 'import_budget.json')) as f:
+    BUDGET = json.load(f)
+
+def environment():
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+def import_times(module):
+    '''
+    {imported module: cumulative microseconds} from python -X importtime
+    '''
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        cwd=ROOT, env=environment(), stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+def run_time(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=environment(), check=True)
+    return time.perf_counter() - start
+
+@unittest.skipIf(sys.version_info < (3, 7), '-X importtime needs python 3.7')
+class TestImportTime(unittest.TestCase):
+    def test_forbidden(self):
+        for module, budget in BUDGET.items():
+            heavy = {name.split('.')[0] for name in import_times(module)} & set(budget['forbidden'])
+            self.assertEqual(heavy, set(), '%s imports %s' % (module, ', '.join(sorted(heavy))))
+
+    def test_budget(self):
+        # relative to the startup of the interpreter (python -c pass) on the same machine, measured
+        # alternately with the import: the time of the import is at most that many startups
+        for module, budget in BUDGET.items():
+            run_time('import %s' % module) # compile and cache the bytecode first
+            startup, imported = [], []
+            for _ in range(5):
+                startup.append(run_time('pass'))
+                imported.append(run_time('import %s' % module))
+            startups = (min(imported) - min(startup)) / min(startup)
+            self.assertLessEqual(startups, budget['startups'], 'import %s: %.2f startups' % (module, startups))
@@ -0,0 +1,50 @@
+import unittest
+import textwrap
+from pseudo_python import translate
+from pseudo_python.incremental import IncrementalTranslator
+
+SOURCE = textwrap.dedent('''
+    def add(a, b):
+        return a + b
+
+    def twice(a):
+        return add(a, a)
+
+    def name(s):
+        return s + "!"
+
+    class Counter:
+        def __init__(self, start):
+            self.value = start
+
+        def next(self, step):
+            return self.value + step
+
+    c = Counter(0)
+    print(c.next(2))
+    print(twice(2))
+    print(name("a"))
+    ''')
+
+class TestIncremental(unittest.TestCase):
+    def check(self, new_source, retranslated):
+        translator = IncrementalTranslator()
+        translator.translate(SOURCE)
+        self.assertEqual(translator.translate(new_source), translate(new_source))
+        self.assertEqual(translator.retranslated, retranslated)
+
+    def test_body_change(self):
+        self.check(SOURCE.replace('return s + "!"', 'return s + "?"'), {('functions', 'name')})
+
+    def test_inferred_callees(self):
+        self.check(SOURCE.replace('return add(a, a)', 'return add(a, a) * 2'), {('functions', 'twice'), ('functions', 'add')})
+
+    def test_method_change(self):
+        self.check(SOURCE.replace('self.value + step', 'step + self.value'), {('Counter', 'next')})
+
+    def test_signature_change_reaching_main(self):
+        self.check(SOURCE.replace('return s + "!"', 'return len(s)'), None)
+
+    def test_moved_definition(self):
+        source = SOURCE.replace('def add(a, b):\n    return a + b\n', '# add\ndef add(a, b):\n    return a + b\n')
+        self.check(source, set())
@@ -0,0 +1,77 @@
+import sys
+import threading
+import time
+import unittest
+import unittest.mock
+from pseudo_python import translate
+from pseudo_python.inference import MAX_STACK_SIZE, components, on_new_stack
+
+def chain(length):
+    functions = ['def f_%d(x):\n    return f_%d(x + 1) + 1\n' % (j, j + 1) for j in range(length)]
+    functions.append('def f_%d(x):\n    return x\n' % length)
+    return '\n'.join(functions) + '\nprint(f_0(1))\n'
+
+def translation_time(source, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        module = translate(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, module
+
+class TestInference(unittest.TestCase):
+    def test_components(self):
+        graph = {'a': ['b'], 'b': ['c', 'd'], 'c': ['b'], 'd': []}
+        self.assertEqual(components(['a', 'b', 'c', 'd'], graph), [['d'], ['c', 'b'], ['a']])
+
+    def test_callees_first(self):
+        module = translate('def first() -> int:\n    return second() + 1\n\ndef second() -> int:\n    return 2\n\nprint(first())\n')
+        self.assertEqual(module['definitions'][0]['block'][0]['value']['pseudo_type'], 'Int')
+
+    def test_translated_once(self):
+        source = 'class A:\n    def __init__(self, x):\n        self.x = x\n\n    def get(self):\n        return self.x\n\ndef g(x):\n    return x + 1\n\na = A(2)\nb = A(3)\nprint(g(a.get()), g(b.x))\n'
+        _, profile = translate(source, profile=True)
+        self.assertEqual({entry['name']: entry['calls'] for entry in profile.as_dict()['definitions']},
+                         {'A.__init__': 1, 'A.get': 1, 'g': 1, 'main': 1})
+
+    def test_recursion_before_base_case(self):
+        module = translate('def f(x):\n    if x > 0:\n        return f(x - 1) * 2\n    else:\n        return 1\n\ndef g(x):\n    if x > 0:\n        y = g(x - 1)\n        return y + 1\n    return 0\n\nprint(f(3), g(2))\n')
+        self.assertEqual([d['pseudo_type'] for d in module['definitions']], [['Function', 'Int', 'Int']] * 2)
+        self.assertEqual(module['definitions'][0]['block'][0]['block'][0]['value']['pseudo_type'], 'Int')
+
+    def test_recursion_in_loops(self):
+        # a pending statement binding a loop variable is translated again in the same env
+        for source in ['def h(n):\n    for i in range(n):\n        if i > 5:\n            return h(n - 1)\n    return 0\n\nprint(h(3))\n',
+                       'def f(n):\n    if n > 0:\n        for i in range(n):\n            print(i)\n        return f(n - 1)\n    return 0\n\nprint(f(3))\n']:
+            module = translate(source)
+            self.assertEqual(module['definitions'][0]['pseudo_type'], ['Function', 'Int', 'Int'])
+
+    def test_long_call_chain(self):
+        small, _ = translation_time(chain(200), 3)
+        large, module = translation_time(chain(2000), 2)
+        self.assertEqual(len(module['definitions']), 2001)
+        self.assertEqual(module['definitions'][0]['pseudo_type'], ['Function', 'Int', 'Int'])
+        self.assertLess(large / 2000, small / 200 * 2)
+
+    def test_on_new_stack(self):
+        sizes = []
+        def stack_size(size=None):
+            if size is not None:
+                sizes.append(size)
+            return 0
+        limit = sys.getrecursionlimit()
+        try:
+            sys.setrecursionlimit(100000)
+            with unittest.mock.patch('threading.stack_size', stack_size):
+                self.assertNotEqual(on_new_stack(threading.get_ident), threading.get_ident())
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual(sizes, [MAX_STACK_SIZE, 0])
+
+        # a refused stack size: on the current stack
+        with unittest.mock.patch('threading.stack_size', side_effect=ValueError('size not valid')):
+            self.assertEqual(on_new_stack(threading.get_ident), threading.get_ident())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import os
+import pickle
+import unittest
+from pseudo_python import translate
+from pseudo_python.nodes import Node, to_dict, to_node
+from pseudo_python.serialization import dump
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+class TestNodes(unittest.TestCase):
+    def test_dict_api(self):
+        node = to_node({'type': 'local', 'name': 'a', 'pseudo_type': 'Int'})
+        self.assertIsInstance(node, Node)
+        self.assertFalse(hasattr(node, '__dict__'))
+        self.assertEqual(node['name'], 'a')
+        self.assertEqual(node.get('value', 2), 2)
+        self.assertIn('pseudo_type', node)
+        node['pseudo_type'] = 'Float'
+        node['values'] = []
+        self.assertEqual(node, {'type': 'local', 'name': 'a', 'pseudo_type': 'Float', 'values': []})
+        self.assertEqual(node.keys(), ['type', 'name', 'pseudo_type', 'values'])
+        with self.assertRaises(KeyError):
+            node['value']
+
+    def test_examples(self):
+        for name in ('fib', 'football', 'oop', 'verbal_expressions'):
+            with open(os.path.join(EXAMPLES, '%s.py' % name)) as f:
+                source = f.read()
+            module = translate(source, slotted=True)
+            self.assertIsInstance(module['main'][0], Node)
+            self.assertEqual(to_dict(module), translate(source))
+            self.assertEqual(dump(module), dump(translate(source)))
+
+    def test_pickle(self):
+        module = translate('a = [2]\nprint(a)\n', slotted=True)
+        self.assertEqual(pickle.loads(pickle.dumps(module)), module)
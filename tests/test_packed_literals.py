@@ -0,0 +1,48 @@
+import unittest
+import pseudo
+from pseudo_python import translate
+from pseudo_python.errors import PseudoPythonTypeCheckError
+from pseudo_python.nodes import to_dict
+from pseudo_python.serialization import dump, load
+
+SOURCE = '''TABLE = [%s]
+NAMES = ['a\\nb', 'c', 'd']
+RATES = [0.5, 1.5]
+
+def at(index):
+    return TABLE[index]
+
+lookup = {2: 'two', 4: 'four'}
+tags = {'a', 'b'}
+mixed = [at(2), 4]
+print(at(2), lookup[2], tags, NAMES[0], RATES[1], mixed)
+''' % ', '.join(str(j) for j in range(100))
+
+class TestPackedLiterals(unittest.TestCase):
+    def test_packed_nodes(self):
+        module = translate(SOURCE, packed=True)
+        table = module['constants'][0]['init']
+        self.assertEqual(table['type'], 'packed_literal')
+        self.assertEqual(table['values'], list(range(100)))
+        self.assertEqual(table['pseudo_type'], ['List', 'Int'])
+        lookup = module['main'][0]['value']
+        self.assertEqual((lookup['kind'], lookup['keys'], lookup['values']), ('dictionary', [2, 4], ['two', 'four']))
+        self.assertEqual(module['main'][2]['value']['type'], 'list') # not only literals
+
+    def test_same_as_unpacked(self):
+        unpacked = translate(SOURCE)
+        for slotted in (False, True):
+            self.assertEqual(to_dict(translate(SOURCE, slotted=slotted, packed=True)), unpacked)
+        self.assertEqual(pseudo.generate(to_dict(translate(SOURCE, packed=True)), 'py'), pseudo.generate(unpacked, 'py'))
+
+    def test_serialization(self):
+        module = translate(SOURCE, packed=True)
+        for format in ('yaml', 'json', 'container'):
+            self.assertEqual(to_dict(load(dump(module, format), format)), translate(SOURCE))
+
+    def test_mixed_types(self):
+        with self.assertRaises(PseudoPythonTypeCheckError):
+            translate('A = [2, 2.5]\nprint(A)\n', packed=True)
+
+if __name__ == '__main__':
+    unittest.main()
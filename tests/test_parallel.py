@@ -0,0 +1,35 @@
+import unittest
+from pseudo_python import translate
+from pseudo_python.errors import PseudoPythonTypeCheckError
+from pseudo_python.nodes import to_dict
+from pseudo_python.parallel import MINIMUM, fork_context
+
+def hinted(count):
+    functions = ['from typing import List\n']
+    for j in range(count):
+        call = '    total += f_%d(values, count)\n' % (j - 1) if j % 3 == 1 else ''
+        functions.append('def f_%d(values: List[int], count: int) -> int:\n    total = 0\n    for value in values:\n        total += value * %d + count\n%s    return total\n' % (j, j, call))
+    # an inferred callee: f_last isn't independent
+    functions.append('def double(x):\n    return x * 2\n')
+    functions.append('def f_last(values: List[int]) -> int:\n    return double(f_0(values, 2))\n')
+    return '\n'.join(functions) + '\nprint(f_last([1, 2]), f_%d([3], 4))\n' % (count - 1)
+
+@unittest.skipIf(fork_context() is None, 'no fork on this platform')
+class TestParallel(unittest.TestCase):
+    def test_same_module(self):
+        source = hinted(MINIMUM + 8)
+        sequential = translate(source)
+        self.assertEqual(translate(source, jobs=2), sequential)
+        self.assertEqual(to_dict(translate(source, slotted=True, jobs=2)), sequential)
+        self.assertEqual([d['name'] for d in sequential['definitions']][-3:], ['f_%d' % (MINIMUM + 7), 'double', 'f_last'])
+
+    def test_error(self):
+        source = hinted(MINIMUM + 8).replace('value * 5 + count', "value * 5 + 'count'")
+        with self.assertRaises(PseudoPythonTypeCheckError) as sequential:
+            translate(source)
+        with self.assertRaises(PseudoPythonTypeCheckError) as parallel:
+            translate(source, jobs=2)
+        self.assertEqual(str(parallel.exception), str(sequential.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import json
+import unittest
+from pseudo_python import translate
+from pseudo_python.ast_translator import ASTTranslator
+
+SOURCE = '''def fib(n):
+    if n < 2:
+        return n
+    else:
+        return fib(n - 1) + fib(n - 2)
+
+class A:
+    def __init__(self, a):
+        self.a = a
+
+    def twice(self):
+        return self.a * 2
+
+print(fib(4) + A(2).twice())
+'''
+
+class TestProfiler(unittest.TestCase):
+    def test_profile(self):
+        module, profile = translate(SOURCE, profile=True)
+        self.assertEqual(module, translate(SOURCE))
+        self.assertEqual(set(profile.definitions), {'main', 'fib', 'A.__init__', 'A.twice'})
+        self.assertEqual(profile.definitions['fib'][0], 1)
+        calls, cumulative, self_time, _, _ = profile.handlers['binop']
+        self.assertEqual(calls, 5)
+        # nested binops are counted once in the cumulative time
+        self.assertLessEqual(self_time, cumulative)
+        self.assertLessEqual(cumulative, profile.total)
+
+        data = json.loads(profile.to_json())
+        self.assertEqual([entry['name'] for entry in data['handlers']],
+                         [entry['name'] for entry in sorted(data['handlers'], key=lambda entry: -entry['self'])])
+        self.assertIn('A.twice', profile.report())
+
+    def test_no_profile(self):
+        translator = ASTTranslator(None, '')
+        self.assertFalse([name for name in vars(translator) if name.startswith('_translate_')])
+
+if __name__ == '__main__':
+    unittest.main()
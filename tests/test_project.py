@@ -0,0 +1,153 @@
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+import pseudo_python.project
+from pseudo_python import translate, translate_project
+from pseudo_python.errors import PseudoPythonNotTranslatableError, PseudoPythonTypeCheckError
+from pseudo_python.project import imports, project_files, translation_order
+from pseudo_python.parser import parse
+
+GEOMETRY = '''class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm(self):
+        return self.x * self.x + self.y * self.y
+
+class Missing(Exception):
+    pass
+
+ORIGIN = 0
+
+def make(x):
+    return Point(x, x)
+
+print(make(2).norm())
+'''
+
+AREA = '''from geometry import make, ORIGIN
+import geometry
+
+def area(p):
+    return p.norm() * 2 + ORIGIN
+
+q = make(3)
+print(area(q), q.x, geometry.make(4).y)
+'''
+
+USE = '''from .area import area
+from geometry import Point, Missing
+
+class Point3(Point):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def z(self):
+        return self.x
+
+print(area(Point(5, 6)), Point3(1, 2).z())
+raise Missing('no')
+'''
+
+SOURCES = {'geometry': GEOMETRY, 'shapes': '', 'shapes.area': AREA, 'shapes.use': USE}
+
+class TestProject(unittest.TestCase):
+    def test_imports(self):
+        self.assertEqual(imports('shapes.use', parse(USE), SOURCES), {'.area': 'shapes.area', 'geometry': 'geometry'})
+        self.assertEqual(translation_order({'a': ['b'], 'b': ['c'], 'c': [], 'd': []}), ['c', 'b', 'a', 'd'])
+        with self.assertRaises(PseudoPythonNotTranslatableError):
+            translation_order({'a': ['b'], 'b': ['a']})
+
+    def test_translate_project(self):
+        modules = translate_project(SOURCES)
+        self.assertEqual(modules['geometry'], translate(GEOMETRY))
+        area = modules['shapes.area']
+        self.assertEqual(area['definitions'][0]['pseudo_type'], ['Function', 'Point', 'Int'])
+        self.assertEqual([arg['pseudo_type'] for arg in area['main'][1]['args']], ['Int', 'Int', 'Int'])
+        use = modules['shapes.use']
+        self.assertEqual([d['name'] for d in use['definitions']], ['Point3'])
+        self.assertEqual(use['definitions'][0]['base'], 'Point')
+        self.assertEqual(use['custom_exceptions'], [])
+        self.assertEqual(translate_project(SOURCES, jobs=2), modules)
+
+    def test_errors(self):
+        f = 'def f(x):\n    return x\n\nprint(f(2))\n'
+        for sources, error in [({'a': f, 'b': 'from a import f\n\ndef f(y):\n    return y\n'}, 'f is already imported from a'),
+                               ({'a': f, 'b': 'import a\nprint(a.g(2))\n'}, "a doesn't define g")]:
+            with self.assertRaises(PseudoPythonNotTranslatableError) as e:
+                translate_project(sources)
+            self.assertEqual((e.exception.module, e.exception.message), ('b', error))
+        with self.assertRaises(PseudoPythonTypeCheckError) as e:
+            translate_project({'a': f, 'b': "import a\nprint(a.f('s'))\n"}, jobs=2)
+        self.assertEqual(e.exception.module, 'b')
+
+    def test_package(self):
+        # import a.b then a.b.<name>, from a import b then b.<name>, in a package on disk
+        sources = {
+            '__init__.py': 'ZERO = 0\n',
+            'use.py': 'def double(x):\n    return x * 2\n\nprint(double(1))\n',
+            'shapes.py': 'from . import use\nfrom pkg import ZERO\n\ndef square(x):\n    return use.double(x) + ZERO\n\nprint(square(2))\n',
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, 'pkg'))
+            for name, source in sources.items():
+                with open(os.path.join(directory, 'pkg', name), 'w') as f:
+                    f.write(source)
+            with open(os.path.join(directory, 'main.py'), 'w') as f:
+                f.write('import pkg.use\nfrom pkg import shapes\n\nprint(pkg.use.double(3), shapes.square(4))\n')
+            files = project_files(directory)
+            self.assertEqual(sorted(files), ['main', 'pkg', 'pkg.shapes', 'pkg.use'])
+            sources = {}
+            for name, filename in files.items():
+                with open(filename) as f:
+                    sources[name] = f.read()
+
+        self.assertEqual(imports('main', parse(sources['main']), sources), {'pkg.use': 'pkg.use', 'pkg.shapes': 'pkg.shapes'})
+        self.assertEqual(imports('pkg.shapes', parse(sources['pkg.shapes']), sources), {'.use': 'pkg.use', 'pkg': 'pkg'})
+        modules = translate_project(sources)
+        self.assertEqual([(arg['function']['name'], arg['pseudo_type']) for arg in modules['main']['main'][0]['args']],
+                         [('double', 'Int'), ('square', 'Int')])
+        with self.assertRaises(PseudoPythonNotTranslatableError) as e:
+            translate_project(dict(sources, main='import pkg.use\nprint(pkg.use.triple(3))\n'))
+        self.assertEqual(e.exception.message, "pkg.use doesn't define triple")
+
+class TestSummaries(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.summaries = {name: os.path.join(self.dir.name, name + '.json') for name in SOURCES}
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def translated(self, sources, targets):
+        with unittest.mock.patch('pseudo_python.project.translate_module', wraps=pseudo_python.project.translate_module) as translate_module:
+            modules = translate_project(sources, targets=targets, summaries=self.summaries)
+        return modules, sorted(call[0][0] for call in translate_module.call_args_list)
+
+    def test_summaries(self):
+        modules, _ = self.translated(SOURCES, None)
+        self.assertTrue(all(os.path.exists(filename) for filename in self.summaries.values()))
+        self.assertEqual(self.translated(SOURCES, ['shapes.use']), ({'shapes.use': modules['shapes.use']}, ['shapes.use']))
+
+        # a new source or a broken summary: translated again, its importers too if its interface changed
+        changed = dict(SOURCES, geometry=GEOMETRY.replace('ORIGIN = 0', 'ORIGIN = 0.5'))
+        _, translated = self.translated(changed, ['shapes.use'])
+        self.assertEqual(translated, ['geometry', 'shapes.area', 'shapes.use'])
+        with open(self.summaries['shapes.area'], 'w') as f:
+            f.write('{')
+        self.assertEqual(self.translated(changed, ['shapes.use'])[1], ['shapes.area', 'shapes.use'])
+
+        # a summary with its key but a truncated or edited interface: translated again too
+        with open(self.summaries['shapes.area']) as f:
+            summary = json.load(f)
+        for interface in ({'module': 'shapes.area'}, dict(summary['interface'], classes=[{}]), dict(summary['interface'], functions=[1])):
+            with open(self.summaries['shapes.area'], 'w') as f:
+                json.dump(dict(summary, interface=interface), f)
+            self.assertEqual(self.translated(changed, ['shapes.use'])[1], ['shapes.area', 'shapes.use'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import gc
+import pickle
+import unittest
+from pseudo_python import translate
+from pseudo_python import pseudo_types
+from pseudo_python.pseudo_types import make_type, intern_type, new_signature
+from pseudo_python.serialization import dump
+
+class TestPseudoTypes(unittest.TestCase):
+    def test_interned(self):
+        t = make_type('Dictionary', 'String', make_type('List', 'Int'))
+        self.assertIs(t, intern_type(['Dictionary', 'String', ['List', 'Int']]))
+        self.assertIs(t[2], make_type('List', 'Int'))
+        self.assertEqual(t, ['Dictionary', 'String', ['List', 'Int']])
+        self.assertNotEqual(t, make_type('Dictionary', 'String', make_type('List', 'Float')))
+        self.assertEqual(len({t, intern_type(list(t))}), 1)
+        self.assertIs(pickle.loads(pickle.dumps(t)), t)
+
+    def test_unused_types_dropped(self):
+        # the fork server and batch workers translate many modules in one process
+        size = len(pseudo_types._types)
+        kept = make_type('Tuple', 'Int', 'Int')
+        for j in range(1000):
+            translate('a = [(%d, "x")]\nprint(a)\n' % j)
+            make_type('Dictionary', 'String%d' % j, make_type('List', 'Float%d' % j))
+        gc.collect()
+        self.assertLess(len(pseudo_types._types), size + 20)
+        self.assertIs(make_type('Tuple', 'Int', 'Int'), kept)
+
+    def test_immutable(self):
+        t = make_type('List', 'Int')
+        with self.assertRaises(TypeError):
+            t[1] = 'Float'
+        with self.assertRaises(TypeError):
+            t.append('Int')
+
+    def test_signature_updates(self):
+        signature = new_signature(2)
+        with self.assertRaises(TypeError):
+            signature[-1] = 'Int'
+        signature.set_args([['List', 'Int'], 'String'])
+        signature.set_return_type('Int')
+        self.assertEqual(signature, ['Function', ['List', 'Int'], 'String', 'Int'])
+        self.assertIs(signature[1], make_type('List', 'Int'))
+        signature.reset(args=False)
+        self.assertEqual(signature, ['Function', ['List', 'Int'], 'String', None])
+        signature.reset()
+        self.assertEqual(signature, ['Function', None, None, None])
+
+    def test_serialized_as_lists(self):
+        module = translate('def f(a):\n    return [a]\n\nb = f(2)\nprint(b)\n')
+        self.assertIs(module['definitions'][0]['return_type'], make_type('List', 'Int'))
+        self.assertIn('- List\n', dump(module))
+        self.assertNotIn('!!', dump(module))
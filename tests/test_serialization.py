@@ -0,0 +1,44 @@
+import unittest
+import yaml
+from pseudo_python import translate
+from pseudo_python.serialization import dump, load
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SOURCE = '''
+def f(a, b):
+    return [a, b]
+
+c = f(2, 4)
+print(c)
+'''
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.module = translate(SOURCE)
+
+    def test_yaml(self):
+        self.assertEqual(load(dump(self.module), 'yaml'), self.module)
+
+    def test_json(self):
+        self.assertEqual(load(dump(self.module, 'json'), 'json'), self.module)
+
+    @unittest.skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack(self):
+        data = dump(self.module, 'msgpack')
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(load(data, 'msgpack'), self.module)
+
+    def test_aliases_per_call(self):
+        shared = ['List', 'Int']
+        module = {'a': shared, 'b': shared}
+        self.assertNotIn('&', dump(module))
+        self.assertIn('&', dump(module, aliases=True))
+        self.assertIn('&', yaml.dump(module))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            dump(self.module, 'xml')
@@ -0,0 +1,57 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import pseudo_python.server
+
+SERVER = '''
+import sys
+from pseudo_python.server import serve
+
+def run():
+    print(' '.join(sys.argv[1:]))
+    print('error', file=sys.stderr)
+    sys.exit(int(sys.argv[1]))
+
+serve(sys.argv[1], run)
+'''
+
+@unittest.skipUnless(pseudo_python.server.supported(), 'needs fork and unix sockets')
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'server.sock')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.server = subprocess.Popen([sys.executable, '-c', SERVER, self.path], cwd=root, stdout=subprocess.DEVNULL)
+        for _ in range(200):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.server.terminate()
+        self.server.wait()
+        self.dir.cleanup()
+
+    def test_forward(self):
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+        try:
+            code = pseudo_python.server.forward(['pseudo-python', '3', 'a.py'], self.path)
+            output, error = sys.stdout.getvalue(), sys.stderr.getvalue()
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+        self.assertEqual((code, output, error), (3, '3 a.py\n', 'error\n'))
+
+    def test_no_server(self):
+        self.assertIsNone(pseudo_python.server.forward(['pseudo-python'], os.path.join(self.dir.name, 'missing.sock')))
+        not_socket = os.path.join(self.dir.name, 'file.sock')
+        open(not_socket, 'w').close()
+        self.assertIsNone(pseudo_python.server.forward(['pseudo-python'], not_socket))
+
+    def test_socket_permissions(self):
+        self.assertTrue(pseudo_python.server.owned_socket(self.path))
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
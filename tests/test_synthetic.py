@@ -0,0 +1,24 @@
+import os
+import sys
+import unittest
+from pseudo_python import translate
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from synthetic import generate
+
+class TestSynthetic(unittest.TestCase):
+    def test_seeded(self):
+        self.assertEqual(generate(4), generate(4))
+        self.assertNotEqual(generate(4), generate(5))
+
+    def test_translatable(self):
+        for seed in range(5):
+            for parameters in ({}, {'functions': 1, 'depth': 1, 'hierarchy': 0},
+                               {'functions': 30, 'depth': 10, 'hierarchy': 6, 'nesting': 20, 'literal': 100}):
+                module = translate(generate(seed, **parameters))
+                names = [definition['name'] for definition in module['definitions']]
+                self.assertEqual(len(names), parameters.get('functions', 20) + parameters.get('hierarchy', 3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import time
+import unittest
+from pseudo_python import translate
+
+def reversed_assignment(n):
+    names = ['x%d' % j for j in range(n)]
+    return ''.join('%s = %d\n' % (name, j) for j, name in enumerate(names)) + \
+        '%s = %s\n' % (', '.join(names), ', '.join(reversed(names)))
+
+def reversed_elements(n):
+    targets = ['a[%d]' % j for j in range(n)]
+    return 'a = [%s]\n%s = %s\n' % (
+        ', '.join(str(j) for j in range(n)), ', '.join(targets), ', '.join(reversed(targets)))
+
+def best_time(source, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        translate(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+class TestTupleAssignment(unittest.TestCase):
+    def test_temporaries(self):
+        main = translate(reversed_assignment(1000))['main']
+        olds = [node['target']['name'] for node in main if node['target']['name'].startswith('_old_')]
+        # x500..x999 are read after being assigned
+        self.assertEqual(olds, ['_old_x%d' % j for j in range(499, -1, -1)])
+        self.assertEqual(len(main), 1000 + 500 + 1000)
+
+        main = translate(reversed_elements(1000))['main']
+        self.assertEqual(main[1]['target']['name'], '_old_499_a')
+        self.assertEqual(main[1 + 500 + 500]['value']['name'], '_old_499_a') # a[500] = a[499]
+
+    def test_1k_elements_scale_linearly(self):
+        for source in (reversed_assignment, reversed_elements):
+            small, large = source(100), source(1000)
+            translate(small)
+            per_small = best_time(small) / 100
+            per_large = best_time(large) / 1000
+            # with linear scans of the assigned targets each one was 3-6x slower at 1000 elements
+            self.assertLess(per_large, per_small * 2)
+
+if __name__ == '__main__':
+    unittest.main()